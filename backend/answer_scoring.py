@@ -0,0 +1,159 @@
+import re
+
+from startup import lazy_import
+from structured_logging import log_stage
+
+# Cheap sentiment lexicon for live estimates; the final score uses TextBlob
+POSITIVE_WORDS = {
+    "accurate", "best", "better", "clear", "confident", "correct", "easy", "effective", "efficient",
+    "excellent", "good", "great", "important", "improve", "improves", "reliable", "robust", "simple",
+    "strong", "successful", "useful", "valuable"
+}
+NEGATIVE_WORDS = {
+    "bad", "confusing", "difficult", "error", "fail", "fails", "hard", "poor", "problem", "risk",
+    "slow", "unclear", "weak", "worse", "worst", "wrong"
+}
+HEDGE_WORDS = {
+    "believe", "feel", "guess", "maybe", "might", "perhaps", "personally", "probably",
+    "seems", "think"
+}
+
+WORD_PATTERN = re.compile(r"\S+")
+PUNCTUATION = ".,;:!?\"'()[]"
+
+
+def performance_band(total_score):
+    """(performance, emoji, feedback) for a total score"""
+    if total_score >= 80:
+        return "Excellent", "🌟", "Outstanding answer!"
+    elif total_score >= 60:
+        return "Good", "👍", "Good job!"
+    elif total_score >= 40:
+        return "Fair", "😐", "Needs improvement"
+    return "Poor", "❌", "Keep practicing"
+
+
+def score_answer(answer, expected_keywords):
+    """Full evaluation of a finished answer"""
+    answer = answer.lower()
+    expected_keywords = [kw.lower() for kw in expected_keywords]
+
+    # Keyword matching
+    keywords_found = [kw for kw in expected_keywords if kw in answer]
+    keyword_score = (len(keywords_found) / len(expected_keywords)) * 40 if expected_keywords else 0
+
+    # Answer length
+    word_count = len(answer.split())
+    length_score = min((word_count / 50) * 25, 25)
+
+    # Sentiment analysis
+    with log_stage("sentiment"):
+        blob = lazy_import("textblob").TextBlob(answer)
+        polarity, subjectivity = blob.sentiment
+    confidence_score = min(abs(polarity) * 20, 20)
+
+    # Clarity (subjectivity)
+    clarity_score = (1 - subjectivity) * 15
+
+    total_score = round(keyword_score + length_score + confidence_score + clarity_score, 1)
+    performance, emoji, feedback = performance_band(total_score)
+
+    return {
+        "total_score": total_score,
+        "breakdown": {
+            "keyword_coverage": round(keyword_score, 1),
+            "answer_length": round(length_score, 1),
+            "confidence": round(confidence_score, 1),
+            "clarity": round(clarity_score, 1)
+        },
+        "keywords_found": keywords_found,
+        "word_count": word_count,
+        "performance": performance,
+        "emoji": emoji,
+        "feedback": feedback
+    }
+
+
+class LiveAnswerScorer:
+    """Running score for an answer that arrives as appended text deltas.
+
+    Each delta is scanned once: keywords are matched against the delta plus
+    a tail just long enough to catch matches that straddle two deltas, and
+    word and sentiment counts are updated from completed words only. The
+    sentiment here is a lexicon estimate; score_answer gives the real one.
+    """
+
+    __slots__ = ("keywords", "found", "tail", "tail_size", "partial", "words",
+                 "positive", "negative", "hedges")
+
+    def __init__(self, expected_keywords):
+        self.keywords = [kw.lower() for kw in expected_keywords]
+        self.found = []
+        self.tail = ""
+        self.tail_size = max((len(kw) for kw in self.keywords), default=1) - 1
+        self.partial = ""
+        self.words = 0
+        self.positive = 0
+        self.negative = 0
+        self.hedges = 0
+
+    def feed(self, delta):
+        delta = delta.lower()
+
+        # Keywords, including ones split across the previous delta
+        window = self.tail + delta
+        for kw in self.keywords:
+            if kw not in self.found and kw in window:
+                self.found.append(kw)
+        self.tail = window[-self.tail_size:] if self.tail_size else ""
+
+        # Words: the last token stays partial until whitespace follows it
+        tokens = WORD_PATTERN.findall(self.partial + delta)
+        if tokens and not delta[-1:].isspace():
+            self.partial = tokens.pop()
+        else:
+            self.partial = ""
+        for token in tokens:
+            self._count_word(token)
+
+    def _count_word(self, token):
+        word = token.strip(PUNCTUATION)
+        self.words += 1
+        if word in POSITIVE_WORDS:
+            self.positive += 1
+        elif word in NEGATIVE_WORDS:
+            self.negative += 1
+        elif word in HEDGE_WORDS:
+            self.hedges += 1
+
+    def snapshot(self):
+        """Estimated score for the text received so far"""
+        word_count = self.words + (1 if self.partial else 0)
+        # Averaged over lexicon hits, like TextBlob, with typical per-word weights
+        opinion = self.positive + self.negative
+        polarity = 0.6 * (self.positive - self.negative) / opinion if opinion else 0.0
+        rated = opinion + self.hedges
+        subjectivity = (0.75 * opinion + self.hedges) / rated if rated else 0.0
+
+        keyword_score = (len(self.found) / len(self.keywords)) * 40 if self.keywords else 0
+        length_score = min((word_count / 50) * 25, 25)
+        confidence_score = min(abs(polarity) * 20, 20)
+        clarity_score = (1 - subjectivity) * 15
+
+        total_score = round(keyword_score + length_score + confidence_score + clarity_score, 1)
+        performance, emoji, feedback = performance_band(total_score)
+
+        return {
+            "total_score": total_score,
+            "breakdown": {
+                "keyword_coverage": round(keyword_score, 1),
+                "answer_length": round(length_score, 1),
+                "confidence": round(confidence_score, 1),
+                "clarity": round(clarity_score, 1)
+            },
+            "keywords_found": list(self.found),
+            "word_count": word_count,
+            "performance": performance,
+            "emoji": emoji,
+            "feedback": feedback
+        }
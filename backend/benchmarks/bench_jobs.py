@@ -0,0 +1,67 @@
+"""Job index: add cost and search latency, including while postings are being added.
+
+Run from backend/:  python benchmarks/bench_jobs.py [postings]
+"""
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_matching import JobIndex  # noqa: E402
+
+WORDS = [f"term{i}" for i in range(3000)] + [
+    "python", "sql", "react", "docker", "aws", "kubernetes", "pandas", "typescript", "java", "spark"
+]
+
+
+def make_text(words):
+    return " ".join(random.choices(WORDS, k=words))
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(int(len(values) * pct / 100), len(values) - 1)]
+
+
+def search_timings(index, resumes):
+    timings = []
+    for resume in resumes:
+        start = time.perf_counter()
+        index.search(resume, 10)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main(count):
+    random.seed(7)
+    jobs = [{"title": f"Job {i}", "description": make_text(250)} for i in range(count)]
+    resumes = [make_text(600) for _ in range(200)]
+
+    index = JobIndex()
+    start = time.perf_counter()
+    for i in range(0, count, 1000):
+        index.add(jobs[i:i + 1000])
+    elapsed = time.perf_counter() - start
+    print(f"add {count:,} postings: {elapsed:.1f} s ({count / elapsed:,.0f}/s); searchable as soon as add returns")
+
+    start = time.perf_counter()
+    index.add(jobs[:1])
+    print(f"add 1 posting to a {count:,}-posting index: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    timings = search_timings(index, resumes)
+    print(f"search (600-word resume)  p50 {percentile(timings, 50):6.1f} ms  p99 {percentile(timings, 99):6.1f} ms")
+
+    # Searches while another thread keeps adding batches of postings
+    extra = [{"title": "Late", "description": make_text(250)} for _ in range(5000)]
+    writer = threading.Thread(target=lambda: [index.add(extra[i:i + 100]) for i in range(0, len(extra), 100)])
+    writer.start()
+    timings = search_timings(index, resumes)
+    writer.join()
+    print(f"search during adds        p50 {percentile(timings, 50):6.1f} ms  p99 {percentile(timings, 99):6.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
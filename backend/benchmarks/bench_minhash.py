@@ -0,0 +1,85 @@
+"""MinHash signing cost and LSH lookup latency at index scale.
+
+Run from backend/:  python benchmarks/bench_minhash.py [signatures]
+"""
+import os
+import random
+import resource
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resume_dedup import NUM_PERM, ResumeIndex, minhash  # noqa: E402
+
+WORDS = [f"word{i}" for i in range(5000)] + ["python", "sql", "docker", "machine", "learning", "aws"]
+
+
+def rss_mib():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(int(len(values) * pct / 100), len(values) - 1)]
+
+
+def near_duplicate(signature, changed):
+    """Copy of a signature with `changed` positions replaced (similarity 1 - changed/NUM_PERM)"""
+    copy = array("I", signature)
+    for i in random.sample(range(NUM_PERM), changed):
+        copy[i] = random.getrandbits(32)
+    return copy
+
+
+def main(count):
+    random.seed(7)
+
+    resume = "\n".join(" ".join(random.choices(WORDS, k=12)) for _ in range(60))
+    start = time.perf_counter()
+    for _ in range(20):
+        minhash(resume)
+    print(f"minhash of a {len(resume.split())}-word resume: {(time.perf_counter() - start) / 20 * 1000:.1f} ms")
+
+    # Random signatures stand in for distinct resumes: the index never looks at text
+    index = ResumeIndex()
+    sample = []
+    base_rss = rss_mib()
+    start = time.perf_counter()
+    for i in range(count):
+        signature = array("I", os.urandom(NUM_PERM * 4))
+        index.add(signature, {"analysis_id": i, "user_id": f"user_{i % 50000}"})
+        if i % max(count // 2000, 1) == 0:
+            sample.append(signature)
+    elapsed = time.perf_counter() - start
+    print(f"indexed {count:,} signatures in {elapsed:.1f} s ({count / elapsed:,.0f}/s), "
+          f"+{rss_mib() - base_rss:,.0f} MiB RSS")
+
+    probes = 2000
+    for label, make_probe in (
+        ("miss (unrelated resume)", lambda: array("I", os.urandom(NUM_PERM * 4))),
+        ("hit (similarity 0.875)", lambda: near_duplicate(random.choice(sample), NUM_PERM // 8)),
+    ):
+        probe_set = [make_probe() for _ in range(probes)]
+        timings = []
+        hits = 0
+        for probe in probe_set:
+            start = time.perf_counter()
+            hits += index.query(probe) is not None
+            timings.append((time.perf_counter() - start) * 1e6)
+        print(f"{label:<26} p50 {percentile(timings, 50):6.1f} us  p99 {percentile(timings, 99):6.1f} us  "
+              f"found {hits}/{probes}")
+
+    # A capped index evicts its oldest entry on every add once full
+    capped = ResumeIndex(max_entries=count // 10)
+    start = time.perf_counter()
+    for i in range(count):
+        capped.add(array("I", os.urandom(NUM_PERM * 4)), {"analysis_id": i})
+    elapsed = time.perf_counter() - start
+    print(f"capped at {count // 10:,}: {count:,} adds in {elapsed:.1f} s ({count / elapsed:,.0f}/s), "
+          f"{len(capped):,} kept")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
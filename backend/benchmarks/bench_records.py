@@ -0,0 +1,71 @@
+"""Encode/decode throughput and per-record memory: plain dicts vs record classes.
+
+Run from backend/:  python benchmarks/bench_records.py [count]
+"""
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import InterviewRecord, decode, encode, from_dict, to_dict  # noqa: E402
+
+
+def make_dict(i):
+    return {
+        "interview_id": f"INT_{i}",
+        "user_id": f"user_{i % 1000}",
+        "timestamp": datetime.now().isoformat(),
+        "target_role": "Data Scientist",
+        "total_score": 72.5,
+        "grade": "B",
+        "questions_answered": 5,
+        "strong_areas": ["Machine Learning", "Optimization"],
+        "weak_areas": ["Data Preprocessing"],
+    }
+
+
+def timed(label, count, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {elapsed * 1000:9.1f} ms  {count / elapsed:12,.0f} records/s")
+    return result
+
+
+def memory_per_record(build, count):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del items
+    return (after - before) / count
+
+
+def main(count):
+    dicts = [make_dict(i) for i in range(count)]
+    records = [from_dict(InterviewRecord, d) for d in dicts]
+
+    print(f"{count:,} interview records\n")
+    blob = timed("dict  json.dumps(indent=2)", count, lambda: json.dumps(dicts, indent=2))
+    timed("dict  json.loads", count, lambda: json.loads(blob))
+    packed = timed("dict  models.encode", count, lambda: encode(dicts))
+    timed("dict  models.decode", count, lambda: decode(packed))
+    packed = timed("record models.encode", count, lambda: encode([to_dict(r) for r in records]))
+    timed("record models.decode + from_dict", count,
+          lambda: [from_dict(InterviewRecord, d) for d in decode(packed)])
+    print(f"\nsize on disk: indent=2 {len(blob) / count:.0f} B/record, compact {len(packed) / count:.0f} B/record")
+
+    # Memory is measured on fresh objects so both sides pay for their own strings
+    dict_bytes = memory_per_record(lambda: [make_dict(i) for i in range(count)], count)
+    record_bytes = memory_per_record(
+        lambda: [from_dict(InterviewRecord, make_dict(i)) for i in range(count)], count)
+    print(f"in memory:    dict {dict_bytes:.0f} B/record, record {record_bytes:.0f} B/record")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,84 @@
+"""Cold import time and per-worker private memory, with and without preload.
+
+Run from backend/:  python benchmarks/bench_startup.py [workers]
+
+Each scenario runs in a fresh interpreter. "lazy" imports main as-is;
+"eager" runs preload() without forking, which is what importing every
+dependency up front used to cost. The fork scenarios preload in a parent,
+fork workers that run a full GC pass (as a long-lived worker would) and
+report each worker's private dirty memory from /proc/self/smaps_rollup.
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_PROBE = """
+import json, resource, time
+start = time.perf_counter()
+import main
+if {eager}:
+    main.preload()
+print(json.dumps({{
+    "import_ms": (time.perf_counter() - start) * 1000,
+    "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+}}))
+"""
+
+FORK_PROBE = """
+import gc, json, os
+import main
+main.preload() if {freeze} else [main.lazy_import(m) for m in ("PyPDF2", "textblob")]
+
+def private_dirty_kb():
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Private_Dirty:"):
+                return int(line.split()[1])
+
+pipes = []
+for _ in range({workers}):
+    r, w = os.pipe()
+    if os.fork() == 0:
+        gc.collect()
+        os.write(w, str(private_dirty_kb()).encode())
+        os._exit(0)
+    os.close(w)
+    pipes.append(r)
+values = [int(os.read(r, 64)) for r in pipes]
+for _ in pipes:
+    os.wait()
+print(json.dumps({{"worker_private_dirty_kb": sum(values) / len(values)}}))
+"""
+
+
+def run(code):
+    # storage.py creates ./data on import, so run probes in a scratch directory
+    with tempfile.TemporaryDirectory() as scratch:
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=scratch, capture_output=True, text=True, check=True,
+            env={**os.environ, "PYTHONPATH": BACKEND_DIR, "SKILLORBIT_PRELOAD": "0"},
+        )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(workers):
+    for label, eager in (("lazy imports", False), ("eager (preload)", True)):
+        runs = [run(IMPORT_PROBE.format(eager=eager)) for _ in range(3)]
+        best = min(runs, key=lambda r: r["import_ms"])
+        print(f"{label:<22} import {best['import_ms']:8.1f} ms   max RSS {best['max_rss_kb'] / 1024:6.1f} MiB")
+
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        print("fork memory probe needs Linux /proc; skipped")
+        return
+
+    for label, freeze in (("fork, no gc.freeze", False), ("fork, preload+freeze", True)):
+        result = run(FORK_PROBE.format(freeze=freeze, workers=workers))
+        print(f"{label:<22} per-worker private dirty {result['worker_private_dirty_kb'] / 1024:6.1f} MiB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 4)
@@ -0,0 +1,96 @@
+"""Sharded record store: append throughput, disk usage and compaction pauses.
+
+Run from backend/:  python benchmarks/bench_storage.py [records]
+
+Records span the last two years, so with the default one-year retention
+about half of them are moved to the archive by compaction.
+"""
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from itertools import islice
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sharded_store  # noqa: E402
+from sharded_store import ShardedStore  # noqa: E402
+
+ROLES = ["Data Scientist", "Frontend Developer", "Backend Developer", "DevOps Engineer", "ML Engineer"]
+SKILLS = ["python", "sql", "react", "docker", "aws", "pandas", "kubernetes", "git", "typescript", "tensorflow"]
+
+
+def make_record(i, now):
+    return {
+        "user_id": f"user_{i % 200000}",
+        "timestamp": (now - timedelta(seconds=random.randrange(2 * 365 * 86400))).isoformat(),
+        "target_role": ROLES[i % len(ROLES)],
+        "match_percentage": random.randrange(100),
+        "skills_found": random.sample(SKILLS, 4),
+        "missing_skills": random.sample(SKILLS, 3)
+    }
+
+
+def mib(size):
+    return f"{size / 2 ** 20:,.1f} MiB"
+
+
+def main(count):
+    random.seed(7)
+    sharded_store.SEAL_GRACE_SECONDS = 0
+    workdir = tempfile.mkdtemp(prefix="bench_storage_")
+    try:
+        store = ShardedStore(os.path.join(workdir, "live"), os.path.join(workdir, "archive"))
+        now = datetime.now()
+
+        json_bytes = 0
+        start = time.perf_counter()
+        for i in range(count):
+            record = make_record(i, now)
+            if i % 1000 == 0:
+                # The old storage was one indented JSON array: sample its size
+                json_bytes += len(json.dumps(record, indent=2)) * 1000
+            store.append(record)
+        elapsed = time.perf_counter() - start
+        print(f"appended {count:,} records in {elapsed:.1f} s ({count / elapsed:,.0f}/s)")
+        print(f"live segments: {mib(store.disk_usage()['live_bytes'])} "
+              f"(single indented JSON file: ~{mib(json_bytes)})")
+
+        results = store.compact(min_segments=1, roll=True)
+        seconds = [stats["seconds"] for stats in results]
+        lock_ms = sorted(stats["lock_ms"] for stats in results)
+        usage = store.disk_usage()
+        print(f"compacted {len(results)} shards: {sum(seconds):.1f} s total, {max(seconds):.1f} s max per shard")
+        print(f"compaction lock held per shard: median {lock_ms[len(lock_ms) // 2]:.2f} ms, max {lock_ms[-1]:.2f} ms")
+        print(f"archived {sum(stats['records_archived'] for stats in results):,} records")
+        print(f"after compaction: live {mib(usage['live_bytes'])}, archive {mib(usage['archive_bytes'])}")
+
+        # Writes since the last compaction sit in raw segments; readers search those by bytes
+        for i in range(count, count + count // 50):
+            store.append(make_record(i, now))
+        users = [f"user_{random.randrange(200000)}" for _ in range(200)]
+        for label, read in (
+            ("count (per save)", store.count_user),
+            ("20-record page", lambda user_id: list(islice(store.iter_user(user_id), 20))),
+        ):
+            timings = []
+            for user_id in users:
+                start = time.perf_counter()
+                read(user_id)
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            print(f"{label:<17} p50 {timings[len(timings) // 2]:6.2f} ms  p99 {timings[int(len(timings) * 0.99)]:6.2f} ms")
+
+        start = time.perf_counter()
+        sum(1 for record in store.iter_shard(store.shard_for(users[0])) if record["user_id"] == users[0])
+        print(f"full shard scan, for comparison: {(time.perf_counter() - start) * 1000:.0f} ms")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000)
@@ -0,0 +1,68 @@
+import gzip
+import hashlib
+
+from fastapi import Request, Response
+
+from models import encode
+
+GZIP_MIN_SIZE = 1024
+CACHE_CONTROL = "public, max-age=3600"
+
+
+class StaticPayload:
+    """Read-only JSON body serialized once, with its ETag and gzip variant.
+
+    The gzip variant is a different representation, so it has its own ETag.
+    """
+
+    __slots__ = ("body", "gzip_body", "etag", "gzip_etag")
+
+    def __init__(self, data):
+        self.body = encode(data)
+        digest = hashlib.sha1(self.body).hexdigest()[:20]
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gz"'
+        self.gzip_body = gzip.compress(self.body, mtime=0) if len(self.body) >= GZIP_MIN_SIZE else None
+
+
+def _etag_matches(header, etag):
+    if header.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in header.split(","))
+
+
+def _accepts_gzip(header):
+    """Whether an Accept-Encoding header allows gzip, honouring q-values (q=0 refuses)"""
+    qualities = {}
+    for item in header.split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            qualities[coding.lower()] = quality
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return False
+
+
+def payload_response(payload: StaticPayload, request: Request) -> Response:
+    """Serve a static payload with conditional GET and gzip negotiation"""
+    use_gzip = payload.gzip_body is not None and _accepts_gzip(request.headers.get("accept-encoding", ""))
+    etag = payload.gzip_etag if use_gzip else payload.etag
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"}
+
+    if _etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=headers)
+
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(payload.gzip_body, media_type="application/json", headers=headers)
+
+    return Response(payload.body, media_type="application/json", headers=headers)
@@ -0,0 +1,15 @@
+# gunicorn -c gunicorn.conf.py main:app
+import os
+
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+bind = os.getenv("BIND", "0.0.0.0:8000")
+
+# Import the app once in the master so workers inherit it copy-on-write
+preload_app = True
+
+
+def when_ready(server):
+    import main
+    report = main.preload()
+    server.log.info(f"Preloaded app: {report}")
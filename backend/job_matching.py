@@ -0,0 +1,106 @@
+import heapq
+import math
+import re
+import threading
+import zlib
+from array import array
+from collections import Counter
+
+# Hashed TF-IDF settings
+N_FEATURES = 2 ** 20
+MAX_DF = 0.5  # terms in more than half of the postings carry no ranking signal
+MAX_QUERY_TERMS = 64
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#./-]*")
+
+
+def hashed_terms(text):
+    """Hash unigrams and bigrams of text into feature ids"""
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    return Counter(zlib.crc32(g.encode()) % N_FEATURES for g in grams)
+
+
+def _tf(count):
+    return 1 + math.log(count)
+
+
+class JobIndex:
+    """In-memory TF-IDF index over job descriptions.
+
+    Postings are stored as an inverted index (feature id -> doc ids and
+    weights), so scoring a resume against the whole corpus is one sparse
+    matrix-vector product that only touches features the resume contains.
+    Weighting is lnc.ltc: postings hold cosine-normalised log tf and idf is
+    applied on the query side from live document frequencies. A posting's
+    weight therefore never depends on other postings, and add() updates the
+    index in place instead of triggering a rebuild.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def __len__(self):
+        return len(self.jobs)
+
+    @property
+    def jobs(self):
+        return self._state[0]
+
+    def add(self, jobs):
+        """Add job postings (dicts with at least a description)"""
+        weighted = []
+        for job in jobs:
+            terms = hashed_terms(f"{job.get('title', '')} {job['description']}")
+            norm = math.sqrt(sum(_tf(c) ** 2 for c in terms.values())) or 1.0
+            weighted.append((job, [(t, _tf(c) / norm) for t, c in terms.items()]))
+
+        with self._lock:
+            jobs, postings = self._state
+            for job, weights in weighted:
+                # The job goes in first so searches never see a posting without its job
+                doc_id = len(jobs)
+                jobs.append(job)
+                for term, weight in weights:
+                    entry = postings.get(term)
+                    if entry is None:
+                        entry = postings[term] = (array("i"), array("f"))
+                    entry[0].append(doc_id)
+                    entry[1].append(weight)
+
+    def clear(self):
+        with self._lock:
+            # (jobs, postings) is replaced as a whole so a search never mixes the two
+            self._state = ([], {})
+
+    def search(self, text, top_k=10):
+        """Return (score, job) pairs for the top_k postings most similar to text"""
+        jobs, postings = self._state
+        n_docs = len(jobs)
+        if not n_docs:
+            return []
+
+        max_df = max(int(MAX_DF * n_docs), 1)
+        weights = {}
+        for term, count in hashed_terms(text).items():
+            entry = postings.get(term)
+            if entry is None:
+                continue
+            df = len(entry[1])
+            if df <= max_df or n_docs < 3:
+                weights[term] = _tf(count) * (math.log((1 + n_docs) / (1 + df)) + 1)
+        query = heapq.nlargest(MAX_QUERY_TERMS, weights.items(), key=lambda item: item[1])
+        norm = math.sqrt(sum(w * w for _, w in query)) or 1.0
+
+        scores = {}
+        get = scores.get
+        for term, weight in query:
+            weight /= norm
+            ids, values = postings[term]
+            for doc_id, value in zip(ids, values):
+                if doc_id < n_docs:
+                    scores[doc_id] = get(doc_id, 0.0) + weight * value
+
+        best = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+        return [(score, jobs[doc_id]) for doc_id, score in best]
@@ -1,27 +1,68 @@
-from fastapi import FastAPI, UploadFile, File, Form
+import time
+_IMPORT_STARTED = time.perf_counter()
+
+from fastapi import FastAPI, UploadFile, File, Form, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
-import PyPDF2
+from starlette.concurrency import run_in_threadpool
+import asyncio
+import heapq
+from collections import deque
+from array import array
+from contextlib import asynccontextmanager
 import io
+import logging
 import re
 import os
-from textblob import TextBlob
 import random
+import threading
 from datetime import datetime
 import uuid
+from job_matching import JobIndex
+from skill_graph import SkillGraph
+from resume_dedup import SIMILARITY_THRESHOLD, ResumeIndex, line_hash, line_hashes, minhash, similarity
+import storage
+from models import decode, encode
+from catalog import StaticPayload, payload_response
+from courses_data import COURSES_DATABASE
+from answer_scoring import LiveAnswerScorer, score_answer
+from startup import IMPORT_TIMES, freeze_heap, lazy_import
+from structured_logging import DroppingQueueHandler, log_stage, request_id_var, setup_logging, stages_var
+
+setup_logging()
+logger = logging.getLogger("skillorbit.api")
+
+# Groq client is built on first use, not at import
+groq_client = None
+_groq_checked = False
+
+def get_groq_client():
+    global groq_client, _groq_checked
+    if not _groq_checked:
+        _groq_checked = True
+        try:
+            lazy_import("dotenv").load_dotenv()
+            GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
+            groq_client = lazy_import("groq").Groq(api_key=GROQ_API_KEY) if GROQ_API_KEY else None
+            logger.info("Groq initialized: %s", groq_client is not None)
+        except Exception as e:
+            logger.warning("Groq not configured - %s", e)
+            groq_client = None
+    return groq_client
 
-try:
-    from groq import Groq
-    from dotenv import load_dotenv
-    load_dotenv()
-    GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
-    groq_client = Groq(api_key=GROQ_API_KEY) if GROQ_API_KEY else None
-    print(f"✅ Groq initialized: {groq_client is not None}")
-except Exception as e:
-    print(f"⚠️  Groq not configured - {e}")
-    groq_client = None
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with the compact codec (orjson when installed)"""
+    def render(self, content) -> bytes:
+        return encode(content)
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app):
+    # Started per worker: threads do not survive the fork from a preloaded master
+    storage.start_background_compaction()
+    yield
+
+app = FastAPI(default_response_class=FastJSONResponse, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -31,6 +72,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def log_requests(request: Request, call_next):
+    """Tag each request with an ID and log one line with per-stage timings"""
+    request_id = request.headers.get("x-request-id") or uuid.uuid4().hex[:16]
+    id_token = request_id_var.set(request_id)
+    stages = {}
+    stages_token = stages_var.set(stages)
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        logger.info("request", extra={
+            "method": request.method,
+            "path": request.url.path,
+            "status": response.status_code,
+            "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+            "stages": stages
+        })
+        return response
+    finally:
+        stages_var.reset(stages_token)
+        request_id_var.reset(id_token)
+
 # Skill requirements database
 ROLE_SKILLS = {
     "Data Scientist": {
@@ -69,6 +133,56 @@ PROJECTS_DATABASE = {
     ]
 }
 
+# Skill -> direct prerequisites, used to order learning paths
+SKILL_PREREQUISITES = {
+    # Data & AI
+    "Machine Learning": ["Python", "Statistics"],
+    "Data Analysis": ["SQL"],
+    "Data Visualization": ["Python"],
+    "Big Data": ["Python", "SQL"],
+    "A/B Testing": ["Statistics"],
+    "Deep Learning": ["Machine Learning"],
+    "Neural Networks": ["Machine Learning"],
+    "NLP": ["Machine Learning"],
+    "Computer Vision": ["Deep Learning"],
+    "TensorFlow": ["Python"],
+    "PyTorch": ["Python"],
+    "Model Optimization": ["Deep Learning"],
+    "Transformers": ["Deep Learning", "NLP"],
+    "LLMs": ["Transformers"],
+    "AutoML": ["Machine Learning"],
+    "Reinforcement Learning": ["Machine Learning"],
+    "Edge AI": ["Model Optimization"],
+    "MLOps": ["Machine Learning", "Docker", "CI/CD"],
+    # Web
+    "React": ["JavaScript", "HTML/CSS"],
+    "Node.js": ["JavaScript"],
+    "TypeScript": ["JavaScript"],
+    "Next.js": ["React", "Node.js"],
+    "GraphQL": ["Node.js"],
+    "PostgreSQL": ["SQL"],
+    # Cloud & DevOps
+    "CI/CD": ["Git"],
+    "Kubernetes": ["Docker"],
+    "Microservices": ["Docker"],
+    "Cloud Infrastructure": ["Networking"],
+    "Security": ["Networking"],
+    "AWS": ["Cloud Infrastructure"],
+    "Azure": ["Cloud Infrastructure"],
+    "Terraform": ["Cloud Infrastructure"],
+    "Serverless": ["Cloud Infrastructure"],
+    "Multi-Cloud": ["AWS", "Azure"],
+    "Cloud Native": ["Kubernetes", "Microservices"],
+    "Service Mesh": ["Kubernetes", "Microservices"],
+    # Product
+    "Roadmapping": ["Product Strategy"],
+    "Go-to-Market": ["Product Strategy"],
+    "Product Analytics": ["Data Analysis"],
+    "Growth Hacking": ["Product Analytics"],
+    "Product-Led Growth": ["Product Analytics", "Go-to-Market"],
+    "AI Product Management": ["Product Strategy"]
+}
+
 INTERVIEW_QUESTIONS = {
     "Data Scientist": [
         {
@@ -168,37 +282,116 @@ INTERVIEW_QUESTIONS = {
     ]
 }
 
+# Skills recognised in resume text
+COMMON_SKILLS = [
+    "Python", "JavaScript", "Java", "C++", "React", "Node.js", "SQL", "MongoDB",
+    "Machine Learning", "Deep Learning", "NLP", "Computer Vision", "Docker", 
+    "Kubernetes", "AWS", "Azure", "Git", "TensorFlow", "PyTorch", "Pandas", "NumPy",
+    "TypeScript", "HTML/CSS", "PostgreSQL", "Redis", "GraphQL", "CI/CD", "DevOps",
+    "Microservices", "REST API", "Agile", "Scrum", "Data Visualization", "Statistics",
+    "Big Data", "Spark", "Hadoop", "ETL", "Data Analysis", "Excel", "Tableau", "Power BI"
+]
+COMMON_SKILLS_LOWER = [(skill, skill.lower()) for skill in COMMON_SKILLS]
+
+RADAR_LABELS = ["Core Skills", "Advanced Skills", "Emerging Tech", "Projects", "Communication"]
+
+COURSE_PLATFORMS = [
+    {"name": "Coursera", "duration": "4-6 weeks", "rating": "4.7", "url": "coursera.org"},
+    {"name": "Udemy", "duration": "8-12 hours", "rating": "4.6", "url": "udemy.com"},
+]
+
 def extract_text_from_pdf(file_bytes):
     """Extract text from PDF"""
     try:
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_bytes))
+        pdf_reader = lazy_import("PyPDF2").PdfReader(io.BytesIO(file_bytes))
         text = ""
         for page in pdf_reader.pages:
             text += page.extract_text()
         return text
     except Exception as e:
-        print(f"PDF extraction error: {e}")
+        logger.warning("PDF extraction error: %s", e)
         return ""
 
 def extract_skills(text):
     """Extract skills from resume text"""
-    common_skills = [
-        "Python", "JavaScript", "Java", "C++", "React", "Node.js", "SQL", "MongoDB",
-        "Machine Learning", "Deep Learning", "NLP", "Computer Vision", "Docker", 
-        "Kubernetes", "AWS", "Azure", "Git", "TensorFlow", "PyTorch", "Pandas", "NumPy",
-        "TypeScript", "HTML/CSS", "PostgreSQL", "Redis", "GraphQL", "CI/CD", "DevOps",
-        "Microservices", "REST API", "Agile", "Scrum", "Data Visualization", "Statistics",
-        "Big Data", "Spark", "Hadoop", "ETL", "Data Analysis", "Excel", "Tableau", "Power BI"
-    ]
-    
-    found_skills = []
     text_lower = text.lower()
-    
-    for skill in common_skills:
-        if skill.lower() in text_lower:
-            found_skills.append(skill)
-    
-    return found_skills
+    return [skill for skill, skill_lower in COMMON_SKILLS_LOWER if skill_lower in text_lower]
+
+def extract_skills_incremental(previous, text):
+    """Skills for a near-duplicate of an analyzed resume: recheck its skills, scan only new lines"""
+    text_lower = text.lower()
+    added_text = "\n".join(line for line in text.splitlines() if line_hash(line) not in previous["lines"])
+    found = {skill for skill in previous["skills"] if skill.lower() in text_lower}
+    found.update(extract_skills(added_text))
+    return [skill for skill in COMMON_SKILLS if skill in found]
+
+# MinHash index of recent analyses, for near-duplicate uploads. Older ones, and
+# ones analyzed by another worker, are still found in the user's stored history.
+RESUME_INDEX_SIZE = int(os.getenv("SKILLORBIT_RESUME_INDEX_SIZE", "100000"))
+STORED_DEDUP_DEPTH = int(os.getenv("SKILLORBIT_STORED_DEDUP_DEPTH", "50"))  # newest analyses checked per miss
+DEDUP_FIELDS = ["analysis_id", "user_id", "target_role", "future_proofing_score",
+                "extracted_skills", "line_hashes", "minhash"]
+resume_index = ResumeIndex(max_entries=RESUME_INDEX_SIZE)
+
+def dedup_entry(record):
+    """Index entry for a stored analysis"""
+    return {
+        "analysis_id": record["analysis_id"],
+        "user_id": record.get("user_id"),
+        "target_role": record["target_role"],
+        "score": record["future_proofing_score"],
+        "skills": record["extracted_skills"],
+        "lines": array("I", record["line_hashes"])
+    }
+
+def find_stored_analysis(signature, user_id):
+    """Best (similarity, entry) among a user's newest STORED_DEDUP_DEPTH stored analyses.
+
+    The read only touches the user's own records (indexed per shard), and
+    only the newest ones are compared.
+    """
+    best = None
+    for record in deque(storage.iter_user_analyses(user_id, fields=DEDUP_FIELDS), maxlen=STORED_DEDUP_DEPTH):
+        if "minhash" not in record:
+            continue
+        score = similarity(signature, record["minhash"])
+        if score >= SIMILARITY_THRESHOLD and (best is None or score >= best[0]):
+            best = (score, dedup_entry(record))
+    return best
+
+def rebuild_resume_index():
+    """Refill the index with the newest stored analyses that carry a signature"""
+    resume_index.clear()
+    records = heapq.nlargest(
+        RESUME_INDEX_SIZE,
+        (record for record in storage.analyses_store.iter_all() if "minhash" in record),
+        key=lambda record: record["timestamp"]
+    )
+    for record in reversed(records):
+        resume_index.add(array("I", record["minhash"]), dedup_entry(record))
+    return len(records)
+
+# Job description corpus for resume matching, folded in from the shared job log
+job_index = JobIndex()
+_job_log = {"offset": 0}
+_job_log_lock = threading.Lock()
+
+def sync_job_index():
+    """Fold postings other workers (or earlier runs) logged into this worker's index"""
+    with _job_log_lock:
+        jobs, cleared, _job_log["offset"] = storage.read_jobs(_job_log["offset"])
+        if cleared:
+            job_index.clear()
+        if jobs:
+            job_index.add(jobs)
+    return len(job_index)
+
+# Prerequisite graph over every role skill, with courses attached
+skill_graph = SkillGraph(
+    SKILL_PREREQUISITES,
+    COURSES_DATABASE,
+    skills=[skill for tiers in ROLE_SKILLS.values() for tier in tiers.values() for skill in tier]
+)
 
 def recommend_projects(missing_skills):
     """Recommend projects"""
@@ -224,17 +417,31 @@ def test():
 async def analyze_resume(
     file: UploadFile = File(...),
     target_role: str = Form(...),
-    target_year: int = Form(2028)
+    target_year: int = Form(2028),
+    user_id: str = Form(None)
 ):
     # 1. Read PDF
-    file_bytes = await file.read()
-    resume_text = extract_text_from_pdf(file_bytes)
+    with log_stage("read_upload"):
+        file_bytes = await file.read()
+    with log_stage("extract_text"):
+        resume_text = extract_text_from_pdf(file_bytes)
     
     if not resume_text:
         return {"error": "Could not extract text from PDF"}
     
-    # 2. Extract skills
-    extracted_skills = extract_skills(resume_text)
+    # 2. Extract skills - reuse the extraction of a near-duplicate earlier upload
+    with log_stage("minhash"):
+        signature = await run_in_threadpool(minhash, resume_text)
+        previous = resume_index.query(signature, user_id)
+        if previous is None and user_id:
+            previous = await run_in_threadpool(find_stored_analysis, signature, user_id)
+        if previous:
+            previous = (previous[0], {**previous[1], "lines": frozenset(previous[1]["lines"])})
+    with log_stage("extract_skills"):
+        if previous:
+            extracted_skills = extract_skills_incremental(previous[1], resume_text)
+        else:
+            extracted_skills = extract_skills(resume_text)
     
     # 3. Get required skills for role
     required_skills = ROLE_SKILLS.get(target_role, ROLE_SKILLS["Data Scientist"])
@@ -269,7 +476,7 @@ async def analyze_resume(
     emerging_total = len(required_skills["emerging"])
     
     radar_data = {
-        "labels": ["Core Skills", "Advanced Skills", "Emerging Tech", "Projects", "Communication"],
+        "labels": RADAR_LABELS,
         "scores": [
             int((core_matched / core_total) * 100) if core_total > 0 else 0,
             int((advanced_matched / advanced_total) * 100) if advanced_total > 0 else 0,
@@ -279,22 +486,22 @@ async def analyze_resume(
         ]
     }
     
-    # 8. Generate insights
+    # 8. Plan learning path - prerequisites first, within the time left until target_year
+    budget_weeks = max((target_year - datetime.now().year) * 52, 12)
+    learning_path = skill_graph.plan(missing_skills, extracted_skills, budget_weeks)
+    focus_skills = [step["skill"] for step in learning_path["steps"]][:3] or missing_skills[:3]
+    
+    # 9. Generate insights
     insights = [
         f"You have {matched_count} out of {total_required} required skills for {target_role}",
-        f"Focus on learning: {', '.join(missing_skills[:3])}" if missing_skills else "Great! You have all core skills",
+        f"Focus on learning: {', '.join(focus_skills)}" if missing_skills else "Great! You have all core skills",
         f"Your future-proofing score is {score}/100"
     ]
     
-    # 9. Recommend courses - Multiple platforms (2 per skill = 6 total)
+    # 10. Recommend courses - Multiple platforms (2 per skill = 6 total)
     recommended_courses = []
-    platforms = [
-        {"name": "Coursera", "duration": "4-6 weeks", "rating": "4.7", "url": "coursera.org"},
-        {"name": "Udemy", "duration": "8-12 hours", "rating": "4.6", "url": "udemy.com"},
-    ]
-    
-    for skill in missing_skills[:3]:  # Top 3 missing skills
-        for platform in platforms:  # 2 courses per skill
+    for skill in focus_skills:  # First 3 skills on the learning path
+        for platform in COURSE_PLATFORMS:  # 2 courses per skill
             recommended_courses.append({
                 "title": f"{'Complete' if platform['name'] == 'Udemy' else 'Master'} {skill}",
                 "provider": platform["name"],
@@ -304,7 +511,7 @@ async def analyze_resume(
                 "url": f"https://www.{platform['url']}/search?query={skill.replace(' ', '%20')}"
             })
     
-    # 10. Recommend projects - FIXED STRUCTURE
+    # 11. Recommend projects - FIXED STRUCTURE
     recommended_projects = [{
         "title": f"Build a {skill} Project",
         "difficulty": "Intermediate",
@@ -315,7 +522,42 @@ async def analyze_resume(
         "github_example": f"https://github.com/topics/{skill.lower().replace(' ', '-')}"
     } for skill in missing_skills[:6]]
     
+    # 12. What changed since this user's previous version of the resume
+    analysis_id = f"ANA_{uuid.uuid4().hex[:12]}"
+    current_lines = line_hashes(resume_text)
+    changes_since_last = None
+    if previous and user_id:
+        previous_similarity, baseline = previous
+        changes_since_last = {
+            "previous_analysis_id": baseline["analysis_id"],
+            "similarity": round(previous_similarity, 2),
+            "skills_added": [s for s in extracted_skills if s not in baseline["skills"]],
+            "skills_removed": [s for s in baseline["skills"] if s not in extracted_skills],
+            "score_change": score - baseline["score"] if baseline["target_role"] == target_role else None,
+            "lines_added": len(current_lines - baseline["lines"]),
+            "lines_removed": len(baseline["lines"] - current_lines)
+        }
+    
+    # Stored with the signature and line hashes so near-duplicates are found after a restart
+    record = {
+        "analysis_id": analysis_id,
+        "user_id": user_id,
+        "target_role": target_role,
+        "target_year": target_year,
+        "future_proofing_score": score,
+        "extracted_skills": extracted_skills,
+        "missing_skills": missing_skills,
+        "file_name": file.filename,
+        "minhash": list(signature),
+        "line_hashes": sorted(current_lines)
+    }
+    if user_id:
+        with log_stage("save"):
+            await run_in_threadpool(storage.save_analysis, user_id, record)
+    resume_index.add(signature, dedup_entry(record))
+    
     return {
+        "analysis_id": analysis_id,
         "extracted_skills": extracted_skills,
         "future_proofing_score": score,
         "skill_gaps": skill_gaps,
@@ -324,7 +566,114 @@ async def analyze_resume(
         "target_role": target_role,
         "target_year": target_year,
         "recommended_courses": recommended_courses,
-        "recommended_projects": recommended_projects
+        "recommended_projects": recommended_projects,
+        "learning_path": learning_path,
+        "changes_since_last": changes_since_last
+    }
+
+
+# CATALOG ENDPOINTS - serialized once, cacheable by the frontend
+CATALOGS = {
+    "roles": StaticPayload(ROLE_SKILLS),
+    "skills": StaticPayload(COMMON_SKILLS),
+    "courses": StaticPayload({"courses": COURSES_DATABASE, "platforms": COURSE_PLATFORMS}),
+    "questions": StaticPayload(INTERVIEW_QUESTIONS),
+}
+
+@app.get("/api/catalog")
+def list_catalogs():
+    return {"catalogs": {name: payload.etag for name, payload in CATALOGS.items()}}
+
+@app.get("/api/catalog/{name}")
+def get_catalog(name: str, request: Request):
+    if name not in CATALOGS:
+        return {"error": f"Unknown catalog: {name}"}
+    return payload_response(CATALOGS[name], request)
+
+
+# LEARNING PATH ENDPOINTS
+class LearningPathRequest(BaseModel):
+    target_role: str
+    current_skills: list[str] = []
+    budget_weeks: int = 26
+
+@app.post("/api/learning-path")
+def plan_learning_path(request: LearningPathRequest):
+    required_skills = ROLE_SKILLS.get(request.target_role, ROLE_SKILLS["Data Scientist"])
+    all_required = required_skills["core"] + required_skills["advanced"] + required_skills["emerging"]
+    missing_skills = [skill for skill in all_required if skill not in request.current_skills]
+    
+    return {
+        "target_role": request.target_role,
+        "missing_skills": missing_skills,
+        **skill_graph.plan(missing_skills, request.current_skills, request.budget_weeks)
+    }
+
+
+# JOB MATCHING ENDPOINTS
+class JobPosting(BaseModel):
+    title: str
+    description: str
+    company: str = ""
+    location: str = ""
+
+@app.post("/api/jobs")
+def add_jobs(postings: list[JobPosting]):
+    jobs = []
+    for posting in postings:
+        job = posting.model_dump()
+        job["job_id"] = f"JOB_{uuid.uuid4().hex[:12]}"
+        job["skills"] = extract_skills(f"{posting.title} {posting.description}")
+        jobs.append(job)
+    
+    storage.append_jobs(jobs)
+    
+    return {
+        "added": len(jobs),
+        "total_jobs": sync_job_index(),
+        "job_ids": [job["job_id"] for job in jobs]
+    }
+
+@app.delete("/api/jobs")
+def clear_jobs():
+    storage.clear_jobs()
+    return {"total_jobs": sync_job_index()}
+
+@app.post("/api/jobs/match")
+async def match_jobs(
+    file: UploadFile = File(...),
+    top_k: int = Form(10)
+):
+    with log_stage("read_upload"):
+        file_bytes = await file.read()
+    with log_stage("extract_text"):
+        resume_text = await run_in_threadpool(extract_text_from_pdf, file_bytes)
+    
+    if not resume_text:
+        return {"error": "Could not extract text from PDF"}
+    
+    extracted_skills = extract_skills(resume_text)
+    
+    with log_stage("search"):
+        await run_in_threadpool(sync_job_index)
+        results = await run_in_threadpool(job_index.search, resume_text, top_k)
+    
+    matches = []
+    for score, job in results:
+        matches.append({
+            "job_id": job["job_id"],
+            "title": job["title"],
+            "company": job["company"],
+            "location": job["location"],
+            "similarity": round(score, 4),
+            "matching_skills": [skill for skill in job["skills"] if skill in extracted_skills],
+            "missing_skills": [skill for skill in job["skills"] if skill not in extracted_skills]
+        })
+    
+    return {
+        "extracted_skills": extracted_skills,
+        "total_jobs": len(job_index),
+        "matches": matches
     }
 
 
@@ -362,49 +711,96 @@ async def start_interview(request: InterviewStartRequest):
 
 @app.post("/api/interview/evaluate")
 async def evaluate_answer(request: AnswerEvaluationRequest):
-    answer = request.answer.lower()
-    expected_keywords = [kw.lower() for kw in request.expected_keywords]
-    
-    # Keyword matching
-    keywords_found = [kw for kw in expected_keywords if kw in answer]
-    keyword_score = (len(keywords_found) / len(expected_keywords)) * 40 if expected_keywords else 0
-    
-    # Answer length
-    word_count = len(answer.split())
-    length_score = min((word_count / 50) * 25, 25)
-    
-    # Sentiment analysis
-    blob = TextBlob(answer)
-    confidence_score = min(abs(blob.sentiment.polarity) * 20, 20)
-    
-    # Clarity (subjectivity)
-    clarity_score = (1 - blob.sentiment.subjectivity) * 15
-    
-    total_score = round(keyword_score + length_score + confidence_score + clarity_score, 1)
-    
-    if total_score >= 80:
-        performance, emoji, feedback = "Excellent", "🌟", "Outstanding answer!"
-    elif total_score >= 60:
-        performance, emoji, feedback = "Good", "👍", "Good job!"
-    elif total_score >= 40:
-        performance, emoji, feedback = "Fair", "😐", "Needs improvement"
-    else:
-        performance, emoji, feedback = "Poor", "❌", "Keep practicing"
+    return score_answer(request.answer, request.expected_keywords)
+
+# Live scoring: the client streams answer text as it is typed or dictated
+LIVE_DEBOUNCE_SECONDS = 0.3
+LIVE_MAX_ANSWER_CHARS = 20000
+
+def parse_live_message(frame):
+    """(message, error) for one raw websocket frame"""
+    try:
+        message = decode(frame.get("text") or frame.get("bytes") or b"")
+    except ValueError:
+        return None, "Message is not valid JSON"
+    if not isinstance(message, dict):
+        return None, "Message must be a JSON object"
+    if not isinstance(message.get("type"), str):
+        return None, "Message needs a string 'type'"
+    if message["type"] == "start":
+        keywords = message.get("expected_keywords", [])
+        if not isinstance(keywords, list) or not all(isinstance(kw, str) for kw in keywords):
+            return None, "'expected_keywords' must be a list of strings"
+    elif message["type"] == "delta" and not isinstance(message.get("text", ""), str):
+        return None, "'text' must be a string"
+    return message, None
+
+@app.websocket("/ws/interview")
+async def interview_socket(websocket: WebSocket):
+    """Messages in: start {question, expected_keywords}, delta {text}, reset, submit.
+
+    Messages out: score (debounced live estimate), final (full evaluation), error.
+    """
+    await websocket.accept()
+    scorer = None
+    expected_keywords = []
+    chunks = []
+    answer_chars = 0
+    pending = None
+    
+    async def push_later():
+        await asyncio.sleep(LIVE_DEBOUNCE_SECONDS)
+        try:
+            await websocket.send_json({"type": "score", **scorer.snapshot()})
+        except Exception as e:
+            # Typically the client went away between the delta and the push
+            logger.warning("Live score push failed: %s", e)
     
-    return {
-        "total_score": total_score,
-        "breakdown": {
-            "keyword_coverage": round(keyword_score, 1),
-            "answer_length": round(length_score, 1),
-            "confidence": round(confidence_score, 1),
-            "clarity": round(clarity_score, 1)
-        },
-        "keywords_found": keywords_found,
-        "word_count": word_count,
-        "performance": performance,
-        "emoji": emoji,
-        "feedback": feedback
-    }
+    try:
+        while True:
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                break
+            message, error = parse_live_message(frame)
+            if error:
+                await websocket.send_json({"type": "error", "error": error})
+                continue
+            kind = message["type"]
+            
+            if kind == "start":
+                expected_keywords = message.get("expected_keywords", [])
+                scorer = LiveAnswerScorer(expected_keywords)
+                chunks = []
+                answer_chars = 0
+            elif scorer is None:
+                await websocket.send_json({"type": "error", "error": "Send a start message first"})
+            elif kind == "reset":
+                scorer = LiveAnswerScorer(expected_keywords)
+                chunks = []
+                answer_chars = 0
+            elif kind == "delta":
+                text = message.get("text", "")
+                if answer_chars + len(text) > LIVE_MAX_ANSWER_CHARS:
+                    await websocket.send_json({"type": "error", "error": "Answer too long"})
+                    continue
+                scorer.feed(text)
+                chunks.append(text)
+                answer_chars += len(text)
+                if pending is None or pending.done():
+                    pending = asyncio.create_task(push_later())
+            elif kind == "submit":
+                if pending is not None:
+                    pending.cancel()
+                result = await run_in_threadpool(score_answer, "".join(chunks), expected_keywords)
+                await websocket.send_json({"type": "final", **result})
+                scorer = None
+            else:
+                await websocket.send_json({"type": "error", "error": f"Unknown message type: {kind}"})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if pending is not None:
+            pending.cancel()
 
 class InterviewCompleteRequest(BaseModel):
     interview_id: str
@@ -450,6 +846,106 @@ async def complete_interview(request: InterviewCompleteRequest):
     }
 
 
+# ANALYTICS ENDPOINTS
+@app.get("/api/analytics")
+def get_analytics(start: str = None, end: str = None, role: str = None):
+    """Dashboard aggregates for an inclusive YYYY-MM-DD range"""
+    return {
+        "start": start,
+        "end": end,
+        **storage.get_analytics(start, end, role)
+    }
+
+
+
+# USER HISTORY ENDPOINTS
+def public_fields(fields):
+    """Client field list without the stored dedup signatures"""
+    if not fields:
+        return None
+    return [field for field in fields.split(",") if field not in storage.ANALYSIS_INTERNAL_FIELDS] or None
+
+HISTORY_STREAMS = {
+    "analyses": (storage.iter_user_analyses, "timestamp", "analysis_id"),
+    "interviews": (storage.iter_user_interviews, "timestamp", "interview_id"),
+    "courses": (storage.iter_user_courses, "enrolled_at", "course_id"),
+}
+
+@app.get("/api/users/{user_id}/achievements")
+def get_user_achievements(user_id: str):
+    """A user's achievements, rendered straight from Achievement records"""
+    return {"achievements": storage.get_user_achievements(user_id)}
+
+@app.get("/api/users/{user_id}/{history}")
+def get_user_history(user_id: str, history: str, after: str = None, limit: int = 20, fields: str = None,
+                     include_archive: bool = False):
+    """One page of a user's history, oldest first, after an optional cursor.
+
+    Records past the retention window are only returned with include_archive=true.
+    """
+    if history not in HISTORY_STREAMS:
+        return {"error": f"Unknown history type: {history}"}
+    
+    iter_records, cursor_key, id_key = HISTORY_STREAMS[history]
+    limit = max(1, min(limit, 100))
+    field_list = public_fields(fields)
+    
+    items = []
+    has_more = False
+    for record in iter_records(user_id, after, field_list, include_archive):
+        if len(items) == limit:
+            has_more = True
+            break
+        items.append(record)
+    
+    return {
+        "items": items,
+        "next_cursor": storage.history_cursor(items[-1], cursor_key, id_key) if has_more else None
+    }
+
+@app.get("/api/users/{user_id}/{history}/export")
+def export_user_history(user_id: str, history: str, after: str = None, fields: str = None,
+                        include_archive: bool = False):
+    """Stream a user's history as NDJSON (archived records with include_archive=true)"""
+    if history not in HISTORY_STREAMS:
+        return {"error": f"Unknown history type: {history}"}
+    
+    iter_records, _, _ = HISTORY_STREAMS[history]
+    field_list = public_fields(fields)
+    lines = (encode(record) + b"\n" for record in iter_records(user_id, after, field_list, include_archive))
+    
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+
+
+# STARTUP
+def preload():
+    """Build everything workers only read, then freeze it for copy-on-write sharing.
+
+    Run in the master before forking (see gunicorn.conf.py) or by setting
+    SKILLORBIT_PRELOAD=1; when both apply, the second call is a no-op.
+    """
+    if STARTUP_REPORT.get("preloaded"):
+        return STARTUP_REPORT
+    for name in ("PyPDF2", "textblob"):
+        lazy_import(name)
+    get_groq_client()
+    STARTUP_REPORT["resume_index_entries"] = rebuild_resume_index()
+    STARTUP_REPORT["job_index_entries"] = sync_job_index()
+    STARTUP_REPORT["frozen_objects"] = freeze_heap()
+    STARTUP_REPORT["preloaded"] = True
+    return STARTUP_REPORT
+
+@app.get("/api/startup")
+def startup_report():
+    return {**STARTUP_REPORT, "lazy_imports_ms": IMPORT_TIMES, "log_records_dropped": DroppingQueueHandler.dropped}
+
+STARTUP_REPORT = {"main_import_ms": round((time.perf_counter() - _IMPORT_STARTED) * 1000, 1)}
+
+if os.getenv("SKILLORBIT_PRELOAD") == "1":
+    preload()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -1,21 +1,32 @@
+import json
+from dataclasses import dataclass, field, fields, is_dataclass
 from datetime import datetime
-from typing import List, Optional
-from pydantic import BaseModel
+from typing import Dict, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Records are slotted dataclasses: no per-instance __dict__, and timestamps
+# default to the moment each record is created rather than module import.
 
 # User Profile
-class UserProfile(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class UserProfile:
     user_id: str
     name: str
     email: str
-    created_at: datetime = datetime.now()
+    created_at: datetime = field(default_factory=datetime.now)
     target_role: str
-    current_skills: List[str] = []
+    current_skills: List[str] = field(default_factory=list)
 
 # Analysis History
-class AnalysisRecord(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class AnalysisRecord:
     analysis_id: str
     user_id: str
-    timestamp: datetime = datetime.now()
+    timestamp: datetime = field(default_factory=datetime.now)
     target_role: str
     target_year: int
     future_proofing_score: int
@@ -24,19 +35,22 @@ class AnalysisRecord(BaseModel):
     file_name: str
 
 # Interview History
-class InterviewRecord(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class InterviewRecord:
     interview_id: str
     user_id: str
-    timestamp: datetime = datetime.now()
+    timestamp: datetime = field(default_factory=datetime.now)
     target_role: str
     total_score: float
     grade: str
     questions_answered: int
     strong_areas: List[str]
     weak_areas: List[str]
+    detailed_scores: List[Dict] = field(default_factory=list)  # per answer: category, score
 
 # Course Progress
-class CourseProgress(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class CourseProgress:
     user_id: str
     course_name: str
     course_url: str
@@ -46,10 +60,64 @@ class CourseProgress(BaseModel):
     completed_at: Optional[datetime] = None
 
 # Achievement/Milestone
-class Achievement(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class Achievement:
     user_id: str
     achievement_type: str  # "first_interview", "skill_gap_closed", "high_score"
     title: str
     description: str
-    earned_at: datetime = datetime.now()
+    earned_at: datetime = field(default_factory=datetime.now)
     icon: str  # emoji or icon name
+
+
+_FIELD_CACHE = {}
+_DATETIME_TYPES = (datetime, Optional[datetime])
+
+
+def _record_fields(cls):
+    """(name, is_datetime) pairs for a record class, computed once"""
+    if cls not in _FIELD_CACHE:
+        _FIELD_CACHE[cls] = tuple((f.name, f.type in _DATETIME_TYPES) for f in fields(cls))
+    return _FIELD_CACHE[cls]
+
+
+def to_dict(record) -> Dict:
+    """Convert a record to a JSON-ready dict (datetimes as ISO strings)"""
+    data = {}
+    for name, is_datetime in _record_fields(type(record)):
+        value = getattr(record, name)
+        data[name] = value.isoformat() if is_datetime and value is not None else value
+    return data
+
+
+def from_dict(cls, data: Dict):
+    """Build a record from a stored dict, ignoring unknown keys"""
+    values = {}
+    for name, is_datetime in _record_fields(cls):
+        if name not in data:
+            continue
+        value = data[name]
+        values[name] = datetime.fromisoformat(value) if is_datetime and isinstance(value, str) else value
+    return cls(**values)
+
+
+def _default(obj):
+    if is_dataclass(obj):
+        return to_dict(obj)
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def encode(obj) -> bytes:
+    """Serialize records/dicts to compact UTF-8 JSON"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=_default).encode()
+
+
+def decode(data):
+    """Parse JSON produced by encode"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,125 @@
+import random
+import re
+import zlib
+from array import array
+
+# 64 permutations in 8 bands of 8 rows: pairs become LSH candidates with
+# probability ~50% at Jaccard 0.77 and >90% at 0.85, and candidates are then
+# checked against SIMILARITY_THRESHOLD using the full signature.
+NUM_PERM = 64
+BANDS = 8
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+SIMILARITY_THRESHOLD = 0.8
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(1729)  # fixed seed: signatures must be comparable across restarts
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME)) for _ in range(NUM_PERM)]
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9+#]+")
+
+
+def line_hash(line):
+    return zlib.crc32(line.strip().lower().encode())
+
+
+def line_hashes(text):
+    """Hashes of the non-blank lines of a text, for line-level diffs"""
+    return frozenset(line_hash(line) for line in text.splitlines() if line.strip())
+
+
+def minhash(text):
+    """64 x 32-bit MinHash signature over word 3-gram shingles"""
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    shingles = {
+        zlib.crc32(" ".join(tokens[i:i + SHINGLE_SIZE]).encode())
+        for i in range(max(len(tokens) - SHINGLE_SIZE + 1, 1))
+    }
+    return array("I", (
+        min((a * x + b) % _MERSENNE_PRIME for x in shingles) & 0xFFFFFFFF
+        for a, b in _PERMUTATIONS
+    ))
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+class ResumeIndex:
+    """LSH index of resume signatures.
+
+    Each signature is split into bands and every band is hashed into its
+    own bucket table, so a lookup is BANDS dict probes plus an exact
+    signature comparison for the few candidates that share a bucket.
+    With max_entries set, the oldest entries are evicted first.
+    """
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries
+        self.clear()
+
+    def clear(self):
+        self._next_id = 0
+        self._docs = {}  # doc id -> (signature bytes, entry)
+        self._buckets = [{} for _ in range(BANDS)]
+
+    def __len__(self):
+        return len(self._docs)
+
+    @staticmethod
+    def _band_keys(signature):
+        raw = signature.tobytes()
+        width = ROWS * signature.itemsize
+        return [hash(raw[i * width:(i + 1) * width]) for i in range(BANDS)]
+
+    def add(self, signature, entry):
+        """Index a signature with its analysis entry (dict)"""
+        doc_id = self._next_id
+        self._next_id += 1
+        self._docs[doc_id] = (signature.tobytes(), entry)
+        for table, key in zip(self._buckets, self._band_keys(signature)):
+            bucket = table.get(key)
+            if bucket is None:
+                table[key] = doc_id  # most buckets hold one resume; skip the list
+            elif isinstance(bucket, list):
+                bucket.append(doc_id)
+            else:
+                table[key] = [bucket, doc_id]
+
+        if self.max_entries is not None:
+            while len(self._docs) > self.max_entries:
+                # Eviction is first in, first out, so live ids are one contiguous range
+                self._evict(self._next_id - len(self._docs))
+
+    def _evict(self, doc_id):
+        raw, _ = self._docs.pop(doc_id)
+        for table, key in zip(self._buckets, self._band_keys(array("I", raw))):
+            bucket = table[key]
+            if isinstance(bucket, list):
+                bucket.remove(doc_id)
+                if len(bucket) == 1:
+                    table[key] = bucket[0]
+            else:
+                del table[key]
+
+    def query(self, signature, user_id=None, threshold=SIMILARITY_THRESHOLD):
+        """Best (similarity, entry) at or above threshold, optionally for one user"""
+        candidates = set()
+        for table, key in zip(self._buckets, self._band_keys(signature)):
+            bucket = table.get(key)
+            if isinstance(bucket, list):
+                candidates.update(bucket)
+            elif bucket is not None:
+                candidates.add(bucket)
+
+        best = None
+        for doc_id in sorted(candidates):
+            raw, entry = self._docs[doc_id]
+            if user_id is not None and entry.get("user_id") != user_id:
+                continue
+            score = similarity(signature, array("I", raw))
+            # Later entries win ties so the most recent version is the baseline
+            if score >= threshold and (best is None or score >= best[0]):
+                best = (score, entry)
+        return best
@@ -0,0 +1,124 @@
+import re
+from functools import lru_cache
+
+DEFAULT_SKILL_WEEKS = 4
+DURATION_PATTERN = re.compile(r"(\d+)\s*(week|month)")
+
+
+def duration_weeks(duration):
+    """'3 months' -> 13, '2 weeks' -> 2; unknown formats get the default"""
+    match = DURATION_PATTERN.search(duration.lower())
+    if not match:
+        return DEFAULT_SKILL_WEEKS
+    amount, unit = int(match.group(1)), match.group(2)
+    return amount if unit == "week" else round(amount * 4.33)
+
+
+class SkillGraph:
+    """Skill prerequisite DAG with its topological order and transitive closure.
+
+    Both are computed once at construction. Learning plans depend only on
+    (missing skills, known skills, budget), so they are cached per signature
+    and repeat requests for a common role/skill-set cost a dict lookup.
+    """
+
+    def __init__(self, prerequisites, courses, skills=()):
+        nodes = set(skills) | set(prerequisites)
+        for required in prerequisites.values():
+            nodes.update(required)
+        self.prerequisites = {skill: tuple(prerequisites.get(skill, ())) for skill in nodes}
+
+        self.order = self._topological_order()
+        self.position = {skill: i for i, skill in enumerate(self.order)}
+
+        # Transitive closure, filled in topological order so prerequisites are done first
+        self.closure = {}
+        for skill in self.order:
+            ancestors = set()
+            for required in self.prerequisites[skill]:
+                ancestors.add(required)
+                ancestors |= self.closure[required]
+            self.closure[skill] = frozenset(ancestors)
+
+        # Best course per skill: courses led by the skill first, then highest rated, then shortest
+        self.courses = {}
+        ranks = {}
+        for course in courses:
+            weeks = duration_weeks(course["duration"])
+            for skill in course["skills"]:
+                rank = (skill != course["skills"][0], -course["rating"], weeks)
+                if skill not in ranks or rank < ranks[skill]:
+                    ranks[skill] = rank
+                    self.courses[skill] = (course, weeks)
+
+        self._plan = lru_cache(maxsize=4096)(self._build_plan)
+
+    def _topological_order(self):
+        """Kahn's algorithm; ties broken by name so the order is stable"""
+        remaining = {skill: len(required) for skill, required in self.prerequisites.items()}
+        dependents = {skill: [] for skill in self.prerequisites}
+        for skill, required in self.prerequisites.items():
+            for prerequisite in required:
+                dependents[prerequisite].append(skill)
+
+        ready = sorted(skill for skill, count in remaining.items() if count == 0)
+        order = []
+        while ready:
+            skill = ready.pop(0)
+            order.append(skill)
+            for dependent in dependents[skill]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+            ready.sort()
+
+        if len(order) != len(self.prerequisites):
+            cyclic = sorted(skill for skill, count in remaining.items() if count)
+            raise ValueError(f"Skill prerequisites contain a cycle: {', '.join(cyclic)}")
+        return order
+
+    def plan(self, missing_skills, known_skills=(), budget_weeks=26):
+        """Ordered learning path that closes missing_skills within budget_weeks"""
+        return self._plan(tuple(missing_skills), frozenset(known_skills), budget_weeks)
+
+    def _build_plan(self, missing_skills, known_skills, budget_weeks):
+        # Targets keep their priority order. Each target is planned together with its
+        # unmet prerequisites or deferred as a unit, so no prerequisite is spent on
+        # a target that then does not fit, and dependents of a deferred target wait too.
+        planned = set()
+        deferred = []
+        steps = []
+        total_weeks = 0
+        for target in missing_skills:
+            if target in planned or target in deferred:
+                continue
+            chain = sorted((self.closure.get(target, frozenset()) | {target}) - known_skills - planned,
+                           key=lambda s: self.position.get(s, len(self.order)))
+            chain_weeks = sum(self.courses.get(skill, (None, DEFAULT_SKILL_WEEKS))[1] for skill in chain)
+            if total_weeks + chain_weeks > budget_weeks or any(skill in deferred for skill in chain):
+                deferred.append(target)
+                continue
+
+            for skill in chain:
+                course, weeks = self.courses.get(skill, (None, DEFAULT_SKILL_WEEKS))
+                planned.add(skill)
+                total_weeks += weeks
+                steps.append({
+                    "skill": skill,
+                    "weeks": weeks,
+                    "prerequisites": [p for p in self.prerequisites.get(skill, ()) if p not in known_skills],
+                    "course": {
+                        "title": course["title"],
+                        "provider": course["provider"],
+                        "url": course["url"],
+                        "duration": course["duration"],
+                        "rating": course["rating"]
+                    } if course else None
+                })
+
+        return {
+            "steps": steps,
+            "total_weeks": total_weeks,
+            "budget_weeks": budget_weeks,
+            "deferred": deferred
+        }
@@ -0,0 +1,28 @@
+import gc
+import importlib
+import sys
+import time
+
+# Milliseconds spent importing each lazily loaded dependency
+IMPORT_TIMES = {}
+
+
+def lazy_import(name):
+    """Import a heavy dependency on first use and record how long it took"""
+    module = sys.modules.get(name)
+    if module is None:
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        IMPORT_TIMES[name] = round((time.perf_counter() - start) * 1000, 1)
+    return module
+
+
+def freeze_heap():
+    """Move every live object to the permanent generation before forking.
+
+    Objects built in the master (catalogs, indexes, imported modules) are
+    then never visited by the collector in workers, so their pages stay
+    shared copy-on-write instead of being dirtied by GC bookkeeping.
+    """
+    gc.freeze()
+    return gc.get_freeze_count()
@@ -0,0 +1,724 @@
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from itertools import chain, islice
+from typing import List, Dict, Iterator, Optional
+from dataclasses import is_dataclass
+from datetime import datetime, timedelta
+
+try:
+    import fcntl
+except ImportError:  # Windows: analytics writes are then only safe within one process
+    fcntl = None
+
+from models import Achievement, decode, encode, from_dict, to_dict
+from sharded_store import ShardedStore, start_compactor
+
+logger = logging.getLogger("skillorbit.storage")
+
+# File paths
+DATA_DIR = "data"
+ANALYSES_DIR = os.path.join(DATA_DIR, "analyses")
+INTERVIEWS_DIR = os.path.join(DATA_DIR, "interviews")
+ARCHIVE_DIR = os.path.join(DATA_DIR, "archive")
+COURSES_FILE = os.path.join(DATA_DIR, "courses.json")
+ACHIEVEMENTS_FILE = os.path.join(DATA_DIR, "achievements.json")
+JOBS_FILE = os.path.join(DATA_DIR, "jobs.ndjson")
+ANALYTICS_DIR = os.path.join(DATA_DIR, "analytics")
+
+# Pre-sharding single-file stores, imported by `python storage.py migrate-shards`
+ANALYSES_FILE = os.path.join(DATA_DIR, "analyses.json")
+INTERVIEWS_FILE = os.path.join(DATA_DIR, "interviews.json")
+
+SHARD_COUNT = int(os.getenv("SKILLORBIT_SHARDS", "16"))
+RETENTION_DAYS = int(os.getenv("SKILLORBIT_RETENTION_DAYS", "365"))
+
+# Dedup signatures stored with each analysis; only returned when asked for by name
+ANALYSIS_INTERNAL_FIELDS = ("minhash", "line_hashes")
+
+# Ensure data directories exist
+os.makedirs(DATA_DIR, exist_ok=True)
+os.makedirs(ANALYTICS_DIR, exist_ok=True)
+
+# Initialize files if they don't exist
+for file_path in [COURSES_FILE, ACHIEVEMENTS_FILE]:
+    if not os.path.exists(file_path):
+        with open(file_path, 'w') as f:
+            json.dump([], f)
+
+# Analyses and interviews grow without bound: shard them by user and archive old records
+analyses_store = ShardedStore(ANALYSES_DIR, os.path.join(ARCHIVE_DIR, "analyses"), SHARD_COUNT, RETENTION_DAYS)
+interviews_store = ShardedStore(INTERVIEWS_DIR, os.path.join(ARCHIVE_DIR, "interviews"), SHARD_COUNT, RETENTION_DAYS)
+
+
+def load_json(file_path: str) -> List[Dict]:
+    """Load data from JSON file"""
+    try:
+        with open(file_path, 'rb') as f:
+            return decode(f.read())
+    except Exception as e:
+        logger.error("Error loading %s: %s", file_path, e)
+        return []
+
+
+def save_json(file_path: str, data: List[Dict]):
+    """Save data to JSON file (via a temp file, so readers never see a partial write)"""
+    try:
+        _write_atomic(file_path, data)
+        return True
+    except Exception as e:
+        logger.error("Error saving to %s: %s", file_path, e)
+        return False
+
+
+def iter_json(file_path: str, chunk_size: int = 65536) -> Iterator[Dict]:
+    """Stream records from a JSON array file without loading it whole"""
+    decoder = json.JSONDecoder()
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            buffer = ""
+            pos = 0
+            eof = False
+            while True:
+                # Skip array punctuation between records
+                while pos < len(buffer) and buffer[pos] in "[], \t\r\n":
+                    pos += 1
+                if pos < len(buffer):
+                    try:
+                        record, pos = decoder.raw_decode(buffer, pos)
+                        yield record
+                        continue
+                    except json.JSONDecodeError:
+                        if eof:
+                            raise
+                elif eof:
+                    return
+                
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer = buffer[pos:] + chunk
+                pos = 0
+    except Exception as e:
+        logger.error("Error streaming %s: %s", file_path, e)
+
+
+def history_cursor(record: Dict, cursor_key: str, id_key: str) -> str:
+    """Opaque page cursor for a history record: `<cursor_key>|<id_key>`."""
+    return f"{record.get(cursor_key, '')}|{record.get(id_key, '')}"
+
+
+def _cursor_position(cursor: str):
+    """Parse a cursor; a bare timestamp from older clients sorts after every id at that time."""
+    position, sep, record_id = cursor.partition("|")
+    return (position, record_id if sep else "\uffff")
+
+
+def _iter_user_records(records: Iterator[Dict], user_id: str, cursor_key: str, id_key: str,
+                       after: Optional[str] = None, fields: Optional[List[str]] = None,
+                       hidden: tuple = ()) -> Iterator[Dict]:
+    """Filter a record stream to one user's records after the `after` cursor.
+
+    Records are ordered by (cursor_key, id_key) rather than append order, so
+    records sharing a timestamp, or appended out of order by two workers, are
+    neither skipped nor repeated across pages. Projected records always keep
+    both keys so callers can build the next cursor with history_cursor.
+    `hidden` keys are dropped unless listed in `fields`.
+    """
+    user_records = sorted(
+        (record for record in records if record.get("user_id") == user_id),
+        key=lambda record: (record.get(cursor_key, ""), record.get(id_key, ""))
+    )
+    start = _cursor_position(after) if after is not None else None
+    for record in user_records:
+        if start is not None and (record.get(cursor_key, ""), record.get(id_key, "")) <= start:
+            continue
+        if fields:
+            record = {k: record[k] for k in [cursor_key, id_key, *fields] if k in record}
+        elif hidden:
+            record = {k: v for k, v in record.items() if k not in hidden}
+        yield record
+
+
+def save_analysis(user_id: str, analysis_data: Dict):
+    """Save skill analysis result (a dict or AnalysisRecord)"""
+    if is_dataclass(analysis_data):
+        analysis_data = to_dict(analysis_data)
+    
+    record = {
+        "user_id": user_id,
+        "timestamp": datetime.now().isoformat(),
+        **analysis_data
+    }
+    
+    # Store the record and update dashboard aggregates
+    _save_with_metrics(analyses_store, record, _analysis_delta)
+    
+    # Check for achievements
+    check_analysis_achievements(user_id, analyses_store.count_user(user_id))
+    
+    return record
+
+
+def save_interview(user_id: str, interview_data: Dict):
+    """Save mock interview result (a dict or InterviewRecord)"""
+    if is_dataclass(interview_data):
+        interview_data = to_dict(interview_data)
+    
+    record = {
+        "user_id": user_id,
+        "timestamp": datetime.now().isoformat(),
+        **interview_data
+    }
+    
+    # Store the record and update dashboard aggregates
+    _save_with_metrics(interviews_store, record, _interview_delta)
+    
+    # Check for achievements
+    check_interview_achievements(user_id, interviews_store.count_user(user_id))
+    
+    return record
+
+
+def iter_user_analyses(user_id: str, after: Optional[str] = None, fields: Optional[List[str]] = None,
+                      include_archive: bool = False) -> Iterator[Dict]:
+    """Stream analyses for a user, oldest first, after an optional history cursor.
+
+    Records older than RETENTION_DAYS have been moved to the archive and are
+    only included with include_archive, which scans the user's archived shard.
+    """
+    records = analyses_store.iter_user(user_id)
+    if include_archive:
+        records = chain(analyses_store.iter_user_archive(user_id), records)
+    return _iter_user_records(records, user_id, "timestamp", "analysis_id", after, fields,
+                              ANALYSIS_INTERNAL_FIELDS)
+
+
+def get_user_analyses(user_id: str, after: Optional[str] = None, limit: Optional[int] = None,
+                      fields: Optional[List[str]] = None, include_archive: bool = False) -> List[Dict]:
+    """Get analyses for a user, optionally one page after a history cursor"""
+    return list(islice(iter_user_analyses(user_id, after, fields, include_archive), limit))
+
+
+def iter_user_interviews(user_id: str, after: Optional[str] = None, fields: Optional[List[str]] = None,
+                         include_archive: bool = False) -> Iterator[Dict]:
+    """Stream interviews for a user, oldest first, after an optional history cursor.
+
+    Records older than RETENTION_DAYS have been moved to the archive and are
+    only included with include_archive, which scans the user's archived shard.
+    """
+    records = interviews_store.iter_user(user_id)
+    if include_archive:
+        records = chain(interviews_store.iter_user_archive(user_id), records)
+    return _iter_user_records(records, user_id, "timestamp", "interview_id", after, fields)
+
+
+def get_user_interviews(user_id: str, after: Optional[str] = None, limit: Optional[int] = None,
+                        fields: Optional[List[str]] = None, include_archive: bool = False) -> List[Dict]:
+    """Get interviews for a user, optionally one page after a history cursor"""
+    return list(islice(iter_user_interviews(user_id, after, fields, include_archive), limit))
+
+
+def iter_user_courses(user_id: str, after: Optional[str] = None, fields: Optional[List[str]] = None,
+                      include_archive: bool = False) -> Iterator[Dict]:
+    """Stream enrolled courses for a user, oldest first, after an optional history cursor.
+
+    Courses are never archived; include_archive only keeps the signature uniform.
+    """
+    return _iter_user_records(iter_json(COURSES_FILE), user_id, "enrolled_at", "course_id", after, fields)
+
+
+def get_user_courses(user_id: str, after: Optional[str] = None, limit: Optional[int] = None,
+                     fields: Optional[List[str]] = None) -> List[Dict]:
+    """Get enrolled courses for a user, optionally one page after a history cursor"""
+    return list(islice(iter_user_courses(user_id, after, fields), limit))
+
+
+def enroll_course(user_id: str, course_data: Dict):
+    """Enroll user in a course"""
+    courses = load_json(COURSES_FILE)
+    
+    record = {
+        "user_id": user_id,
+        "enrolled_at": datetime.now().isoformat(),
+        "completed": False,
+        "progress": 0,
+        **course_data
+    }
+    
+    courses.append(record)
+    save_json(COURSES_FILE, courses)
+    return record
+
+
+def update_course_progress(user_id: str, course_id: str, progress: int, completed: bool = False):
+    """Update course progress"""
+    courses = load_json(COURSES_FILE)
+    
+    for course in courses:
+        if course["user_id"] == user_id and course.get("course_id") == course_id:
+            course["progress"] = progress
+            course["completed"] = completed
+            if completed:
+                course["completed_at"] = datetime.now().isoformat()
+            break
+    
+    save_json(COURSES_FILE, courses)
+    
+    # Check for achievements
+    if completed:
+        user_courses = get_user_courses(user_id)
+        completed_count = len([c for c in user_courses if c.get("completed")])
+        check_course_achievements(user_id, completed_count)
+
+
+def get_user_achievements(user_id: str) -> List[Achievement]:
+    """Get all achievements for a user"""
+    achievements = load_json(ACHIEVEMENTS_FILE)
+    return [from_dict(Achievement, a) for a in achievements if a["user_id"] == user_id]
+
+
+def award_achievement(user_id: str, achievement_type: str, title: str, description: str, icon: str):
+    """Award an achievement to a user"""
+    achievements = load_json(ACHIEVEMENTS_FILE)
+    
+    # Check if already awarded
+    existing = [a for a in achievements if a["user_id"] == user_id and a["achievement_type"] == achievement_type]
+    if existing:
+        return None
+    
+    record = Achievement(
+        user_id=user_id,
+        achievement_type=achievement_type,
+        title=title,
+        description=description,
+        icon=icon
+    )
+    
+    achievements.append(record)
+    save_json(ACHIEVEMENTS_FILE, achievements)
+    return record
+
+
+def check_analysis_achievements(user_id: str, count: int):
+    """Check and award analysis-related achievements"""
+    if count == 1:
+        award_achievement(user_id, "first_analysis", "First Step", "Completed your first skill analysis", "🎯")
+    elif count == 5:
+        award_achievement(user_id, "analysis_5", "Analyzer", "Completed 5 skill analyses", "📊")
+    elif count == 10:
+        award_achievement(user_id, "analysis_10", "Expert Analyzer", "Completed 10 skill analyses", "🔥")
+
+
+def check_interview_achievements(user_id: str, count: int):
+    """Check and award interview-related achievements"""
+    if count == 1:
+        award_achievement(user_id, "first_interview", "Interview Rookie", "Completed your first mock interview", "🎤")
+    elif count == 3:
+        award_achievement(user_id, "interview_3", "Interview Pro", "Completed 3 mock interviews", "💼")
+    elif count == 10:
+        award_achievement(user_id, "interview_10", "Interview Master", "Completed 10 mock interviews", "👑")
+
+
+def check_course_achievements(user_id: str, count: int):
+    """Check and award course-related achievements"""
+    if count == 1:
+        award_achievement(user_id, "first_course", "Lifelong Learner", "Completed your first course", "📚")
+    elif count == 5:
+        award_achievement(user_id, "course_5", "Knowledge Seeker", "Completed 5 courses", "🎓")
+    elif count == 10:
+        award_achievement(user_id, "course_10", "Scholar", "Completed 10 courses", "🏆")
+
+
+# Job postings - an append-only log shared by every worker.
+#
+# Each line is a posting, or a {"clear": true} marker written when the corpus
+# is cleared. Workers fold in lines after their last offset before searching,
+# so every worker sees the same corpus and it survives restarts.
+def append_jobs(jobs: List[Dict]):
+    """Append postings to the job log in one write"""
+    _append_job_lines(b"".join(encode(job) + b"\n" for job in jobs))
+
+
+def clear_jobs():
+    """Mark every posting logged so far as removed"""
+    _append_job_lines(encode({"clear": True}) + b"\n")
+
+
+def _append_job_lines(data: bytes):
+    with open(JOBS_FILE, "ab") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        f.write(data)
+
+
+def read_jobs(offset: int = 0):
+    """Complete job log lines after `offset`: (postings, cleared, new offset).
+
+    Postings before the last clear marker are dropped; `cleared` tells the
+    caller to empty its index before adding the rest.
+    """
+    jobs = []
+    cleared = False
+    try:
+        with open(JOBS_FILE, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # a write in progress; picked up on the next read
+                offset += len(line)
+                if not line.strip():
+                    continue
+                job = decode(line)
+                if job.get("clear"):
+                    jobs = []
+                    cleared = True
+                else:
+                    jobs.append(job)
+    except FileNotFoundError:
+        pass
+    return jobs, cleared, offset
+
+
+# Analytics - aggregates bucketed by day.
+#
+# Every save appends a small delta line to analytics/<day>.ndjson, so workers
+# never overwrite each other. Each process folds new lines into its in-memory
+# aggregates by file offset before serving them. Days older than yesterday no
+# longer get writes and are sealed into analytics/<day>.json (written to a temp
+# file and renamed), so a crash mid-write can only cost the line being written.
+# A rebuild replaces every file and bumps analytics/GENERATION; processes that
+# see a new generation drop their offsets, since a recreated file can reuse
+# the old inode.
+ANALYTICS_GENERATION_FILE = os.path.join(ANALYTICS_DIR, "GENERATION")
+_analytics = {"days": {}, "generation": None}
+_analytics_seen: Dict[str, tuple] = {}  # day -> ("json", inode, mtime_ns, size) or ("log", inode, offset)
+_analytics_refresh_lock = threading.Lock()
+
+
+@contextmanager
+def _analytics_file_lock():
+    """Cross-process lock for appending, sealing and rebuilding analytics files"""
+    with open(os.path.join(ANALYTICS_DIR, ".lock"), "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+
+
+def _empty_day() -> Dict:
+    return {"analyses": {}, "interviews": {"count": 0, "grades": {}, "categories": {}}}
+
+
+def _write_atomic(path: str, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(encode(data))
+    os.replace(tmp_path, path)
+
+
+def _apply_delta(bucket: Dict, delta: Dict):
+    """Fold one delta line into a day's aggregates"""
+    if delta["kind"] == "base":
+        bucket.clear()
+        bucket.update(delta["bucket"])
+    elif delta["kind"] == "analysis":
+        roles = bucket["analyses"]
+        if delta["role"] not in roles:
+            roles[delta["role"]] = {"count": 0, "missing_skills": {}, "score_histogram": {}}
+        stats = roles[delta["role"]]
+        stats["count"] += 1
+        for skill in delta["missing_skills"]:
+            stats["missing_skills"][skill] = stats["missing_skills"].get(skill, 0) + 1
+        if delta.get("score_bucket"):
+            histogram = stats["score_histogram"]
+            histogram[delta["score_bucket"]] = histogram.get(delta["score_bucket"], 0) + 1
+    elif delta["kind"] == "interview":
+        stats = bucket["interviews"]
+        stats["count"] += 1
+        if delta.get("grade"):
+            stats["grades"][delta["grade"]] = stats["grades"].get(delta["grade"], 0) + 1
+        for category, score in delta["categories"]:
+            if category not in stats["categories"]:
+                stats["categories"][category] = {"count": 0, "total_score": 0}
+            stats["categories"][category]["count"] += 1
+            stats["categories"][category]["total_score"] += score
+
+
+def _load_snapshot(file_path: str) -> Dict:
+    with open(file_path, "rb") as f:
+        return decode(f.read())
+
+
+def _analytics_generation() -> int:
+    try:
+        return _load_snapshot(ANALYTICS_GENERATION_FILE)
+    except FileNotFoundError:
+        return 0
+
+
+def _read_day_log(path: str, bucket: Dict, offset: int = 0) -> int:
+    """Fold complete lines after `offset` into bucket; returns the new offset"""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # a write in progress; picked up on the next refresh
+            offset += len(line)
+            if line.strip():
+                _apply_delta(bucket, decode(line))
+    return offset
+
+
+def _seal_day(day: str):
+    """Fold a finished day's log into its snapshot and remove the log"""
+    log_path = os.path.join(ANALYTICS_DIR, f"{day}.ndjson")
+    json_path = os.path.join(ANALYTICS_DIR, f"{day}.json")
+    with _analytics_file_lock():
+        if not os.path.exists(log_path):
+            return
+        bucket = _load_snapshot(json_path) if os.path.exists(json_path) else _empty_day()
+        _read_day_log(log_path, bucket)
+        _write_atomic(json_path, bucket)
+        os.remove(log_path)
+
+
+def load_analytics() -> Dict:
+    """Bring the in-memory aggregates up to date with the files on disk"""
+    with _analytics_refresh_lock:
+        generation = _analytics_generation()
+        if generation != _analytics["generation"]:
+            # First load, or the files were rebuilt: offsets and inodes no longer apply
+            _analytics["days"].clear()
+            _analytics_seen.clear()
+            _analytics["generation"] = generation
+        days = _analytics["days"]
+        names = os.listdir(ANALYTICS_DIR)
+        sealed = {name[:-5] for name in names if name.endswith(".json")}
+        logs = {name[:-7] for name in names if name.endswith(".ndjson")} - sealed
+
+        for day in sealed:
+            path = os.path.join(ANALYTICS_DIR, f"{day}.json")
+            try:
+                st = os.stat(path)
+                state = ("json", st.st_ino, st.st_mtime_ns, st.st_size)
+                if _analytics_seen.get(day) != state:
+                    days[day] = _load_snapshot(path)
+                    _analytics_seen[day] = state
+            except FileNotFoundError:
+                sealed.discard(day)  # removed by a rebuild since the listing
+            except Exception as e:
+                logger.error("Error loading %s: %s", path, e)
+
+        for day in logs:
+            path = os.path.join(ANALYTICS_DIR, f"{day}.ndjson")
+            try:
+                st = os.stat(path)
+                inode = st.st_ino
+                state = _analytics_seen.get(day)
+                if state is None or state[:2] != ("log", inode) or st.st_size < state[2]:
+                    # New log, or replaced since the last read: read it from the start
+                    days[day] = _empty_day()
+                    state = ("log", inode, 0)
+                _analytics_seen[day] = ("log", inode, _read_day_log(path, days[day], state[2]))
+            except FileNotFoundError:
+                logs.discard(day)  # sealed since the listing; the snapshot is read next time
+            except Exception as e:
+                logger.error("Error loading %s: %s", path, e)
+
+        for day in list(days):
+            if day not in sealed and day not in logs and day in _analytics_seen:
+                del days[day]
+                del _analytics_seen[day]
+
+    yesterday = (datetime.now() - timedelta(days=1)).date().isoformat()
+    for day in logs:
+        if day < yesterday:
+            _seal_day(day)
+    return _analytics
+
+
+def _append_delta(day: str, delta: Dict):
+    """Record one save in the day's delta log (or its snapshot, for a sealed day).
+
+    The caller holds _analytics_file_lock.
+    """
+    try:
+        json_path = os.path.join(ANALYTICS_DIR, f"{day}.json")
+        if os.path.exists(json_path):
+            bucket = _load_snapshot(json_path)
+            _apply_delta(bucket, delta)
+            _write_atomic(json_path, bucket)
+        else:
+            with open(os.path.join(ANALYTICS_DIR, f"{day}.ndjson"), "ab") as f:
+                f.write(encode(delta) + b"\n")
+    except Exception as e:
+        logger.error("Error recording analytics for %s: %s", day, e)
+
+
+def _save_with_metrics(store: ShardedStore, record: Dict, make_delta):
+    """Append a record and its analytics delta under the analytics lock.
+
+    rebuild_analytics scans the stores under the same lock, so each record is
+    counted exactly once: either in the rebuilt files or as a later delta.
+    """
+    with _analytics_file_lock():
+        store.append(record)
+        _append_delta(_record_day(record), make_delta(record))
+
+
+def _record_day(record: Dict) -> str:
+    timestamp = record.get("timestamp") or datetime.now()
+    return (timestamp.isoformat() if isinstance(timestamp, datetime) else timestamp)[:10]
+
+
+def _missing_skills(record: Dict) -> List[str]:
+    """Missing skills from an analysis record (API result or AnalysisRecord shape)"""
+    if "missing_skills" in record:
+        return record["missing_skills"]
+    missing = []
+    for gap in record.get("skill_gaps", []):
+        if isinstance(gap, dict):
+            if gap.get("status") == "missing":
+                missing.append(gap["skill"])
+        else:
+            missing.append(gap)
+    return missing
+
+
+def _analysis_delta(record: Dict) -> Dict:
+    delta = {"kind": "analysis", "role": record.get("target_role", "Unknown"),
+             "missing_skills": _missing_skills(record)}
+    score = record.get("future_proofing_score")
+    if score is not None:
+        low = min(int(score) // 10 * 10, 90)
+        delta["score_bucket"] = f"{low}-{low + 9 if low < 90 else 100}"
+    return delta
+
+
+def _interview_delta(record: Dict) -> Dict:
+    return {
+        "kind": "interview",
+        "grade": record.get("grade"),
+        "categories": [[answer.get("category", "General"), answer.get("score", 0)]
+                       for answer in record.get("detailed_scores", [])]
+    }
+
+
+def record_analysis_metrics(record: Dict):
+    """Add one analysis to the day's per-role aggregates"""
+    with _analytics_file_lock():
+        _append_delta(_record_day(record), _analysis_delta(record))
+
+
+def record_interview_metrics(record: Dict):
+    """Add one interview to the day's grade and per-category aggregates"""
+    with _analytics_file_lock():
+        _append_delta(_record_day(record), _interview_delta(record))
+
+
+def get_analytics(start_day: Optional[str] = None, end_day: Optional[str] = None, role: Optional[str] = None) -> Dict:
+    """Merge daily aggregates for an inclusive YYYY-MM-DD range"""
+    analyses = {}
+    interviews = {"count": 0, "grades": {}, "categories": {}}
+    
+    for day, bucket in list(load_analytics()["days"].items()):
+        if (start_day and day < start_day) or (end_day and day > end_day):
+            continue
+        
+        for role_name, stats in bucket["analyses"].items():
+            if role and role_name != role:
+                continue
+            merged = analyses.setdefault(role_name, {"count": 0, "missing_skills": {}, "score_histogram": {}})
+            merged["count"] += stats["count"]
+            for key in ("missing_skills", "score_histogram"):
+                for name, count in stats[key].items():
+                    merged[key][name] = merged[key].get(name, 0) + count
+        
+        interviews["count"] += bucket["interviews"]["count"]
+        for grade, count in bucket["interviews"]["grades"].items():
+            interviews["grades"][grade] = interviews["grades"].get(grade, 0) + count
+        for category, stats in bucket["interviews"]["categories"].items():
+            merged = interviews["categories"].setdefault(category, {"count": 0, "total_score": 0})
+            merged["count"] += stats["count"]
+            merged["total_score"] += stats["total_score"]
+    
+    for stats in analyses.values():
+        stats["top_missing_skills"] = sorted(stats["missing_skills"].items(), key=lambda item: -item[1])[:10]
+    for stats in interviews["categories"].values():
+        stats["average_score"] = round(stats["total_score"] / stats["count"], 1) if stats["count"] else 0
+    
+    return {"analyses": analyses, "interviews": interviews}
+
+
+def rebuild_analytics():
+    """Backfill aggregates from all stored analyses and interviews.
+
+    Saves wait on the analytics lock for the whole rebuild, so none is dropped
+    or counted twice.
+    """
+    with _analytics_file_lock():
+        days = {}
+        for store, make_delta in ((analyses_store, _analysis_delta), (interviews_store, _interview_delta)):
+            for records in (store.iter_archive(), store.iter_all()):
+                for record in records:
+                    day = _record_day(record)
+                    _apply_delta(days.setdefault(day, _empty_day()), make_delta(record))
+        
+        # Replace every file at once; days that may still get writes stay as logs with a base line
+        yesterday = (datetime.now() - timedelta(days=1)).date().isoformat()
+        for name in os.listdir(ANALYTICS_DIR):
+            if name.endswith((".json", ".ndjson")):
+                os.remove(os.path.join(ANALYTICS_DIR, name))
+        for day, bucket in days.items():
+            if day < yesterday:
+                _write_atomic(os.path.join(ANALYTICS_DIR, f"{day}.json"), bucket)
+            else:
+                path = os.path.join(ANALYTICS_DIR, f"{day}.ndjson")
+                with open(f"{path}.tmp", "wb") as f:
+                    f.write(encode({"kind": "base", "bucket": bucket}) + b"\n")
+                os.replace(f"{path}.tmp", path)
+        _write_atomic(ANALYTICS_GENERATION_FILE, _analytics_generation() + 1)
+    
+    return load_analytics()
+
+
+# Compaction and migration
+def compact_storage(min_segments: int = 2, roll: bool = False) -> List[Dict]:
+    """Compact every shard of both stores once"""
+    return analyses_store.compact(min_segments, roll) + interviews_store.compact(min_segments, roll)
+
+
+def start_background_compaction(interval: int = 300):
+    """Compact both stores periodically in a daemon thread; workers skip shards another process is compacting"""
+    return start_compactor([analyses_store, interviews_store], interval)
+
+
+def migrate_json_to_shards() -> Dict[str, int]:
+    """Move records from the old analyses.json / interviews.json into the sharded stores"""
+    migrated = {}
+    for file_path, store in ((ANALYSES_FILE, analyses_store), (INTERVIEWS_FILE, interviews_store)):
+        count = 0
+        if os.path.exists(file_path):
+            for record in iter_json(file_path):
+                store.append(record)
+                count += 1
+            os.replace(file_path, file_path + ".migrated")
+        migrated[os.path.basename(file_path)] = count
+    return migrated
+
+
+if __name__ == "__main__":
+    import sys
+    
+    command = sys.argv[1:]
+    if command == ["backfill-analytics"]:
+        days = rebuild_analytics()["days"]
+        print(f"Rebuilt analytics for {len(days)} days")
+    elif command == ["migrate-shards"]:
+        print(f"Migrated records: {migrate_json_to_shards()}")
+    elif command == ["compact"]:
+        for stats in compact_storage(min_segments=1, roll=True):
+            print(stats)
+    else:
+        print("Usage: python storage.py [backfill-analytics | migrate-shards | compact]")
@@ -0,0 +1,169 @@
+import atexit
+import contextvars
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+QUEUE_SIZE = 10000
+RATE_LIMIT_WINDOW = 60.0  # seconds
+RATE_LIMIT_BURST = 5  # identical warnings/errors let through per window
+RATE_LIMIT_KEY_CHARS = 200  # rendered message prefix that identifies a warning/error
+RATE_LIMIT_MAX_KEYS = 1024
+
+request_id_var = contextvars.ContextVar("request_id", default="-")
+stages_var = contextvars.ContextVar("stages", default=None)
+
+_listener = None
+
+
+@contextmanager
+def log_stage(name):
+    """Time a block and attach its duration to the current request's log line"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stages = stages_var.get()
+        if stages is not None:
+            stages[name] = round((time.perf_counter() - start) * 1000, 2)
+
+
+class RequestContextFilter(logging.Filter):
+    """Stamp records with the request ID while still on the caller's context"""
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """Let a burst of identical warnings/errors through per window, count the rest.
+
+    Records are identical when their rendered message prefix and exception
+    type match, so one template failing for different inputs is not collapsed.
+    """
+
+    def __init__(self, window=RATE_LIMIT_WINDOW, burst=RATE_LIMIT_BURST):
+        super().__init__()
+        self.window = window
+        self.burst = burst
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno < logging.WARNING:
+            return True
+
+        exc_type = record.exc_info[0].__name__ if record.exc_info and record.exc_info[0] else None
+        key = (record.name, record.getMessage()[:RATE_LIMIT_KEY_CHARS], exc_type)
+        now = time.monotonic()
+        with self._lock:
+            if key not in self._seen and len(self._seen) >= RATE_LIMIT_MAX_KEYS:
+                self._prune(now)
+            started, count, suppressed = self._seen.get(key, (now, 0, 0))
+            if now - started >= self.window:
+                started, count = now, 0
+            if count >= self.burst:
+                self._seen[key] = (started, count, suppressed + 1)
+                return False
+            self._seen[key] = (started, count + 1, 0)
+
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+    def _prune(self, now):
+        """Forget expired keys; if none have expired, the oldest one"""
+        expired = [key for key, (started, _, _) in self._seen.items() if now - started >= self.window]
+        for key in expired or [next(iter(self._seen))]:
+            del self._seen[key]
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Queue handler that never blocks: when the writer falls behind, records are dropped.
+
+    The next record that gets through carries the number dropped since the
+    previous one; `dropped` is the process total, reported by /api/startup.
+    """
+
+    dropped = 0
+    _unreported = 0
+    _count_lock = threading.Lock()
+
+    def enqueue(self, record):
+        with self._count_lock:
+            unreported = DroppingQueueHandler._unreported
+            DroppingQueueHandler._unreported = 0
+        if unreported:
+            record.dropped = unreported
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._count_lock:
+                DroppingQueueHandler.dropped += 1
+                DroppingQueueHandler._unreported += unreported + 1
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    FIELDS = ("request_id", "method", "path", "status", "duration_ms", "stages", "suppressed", "dropped")
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for name in self.FIELDS:
+            if hasattr(record, name):
+                entry[name] = getattr(record, name)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def setup_logging(level=logging.INFO, stream=None):
+    """Route the 'skillorbit' loggers through a background writer thread.
+
+    Request handlers only format the message and put it on a bounded queue;
+    the listener thread does the (possibly slow) write to stdout.
+    """
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter())
+
+    handler = DroppingQueueHandler(None)
+    handler.addFilter(RequestContextFilter())
+    handler.addFilter(RateLimitFilter())
+
+    root = logging.getLogger("skillorbit")
+    root.setLevel(level)
+    root.addHandler(handler)
+    root.propagate = False
+
+    _start_listener(handler, output)
+    atexit.register(_stop_listener)
+    # The writer thread does not survive a fork (gunicorn preload_app): give each
+    # child its own queue and thread. The inherited queue belongs to the parent.
+    os.register_at_fork(after_in_child=lambda: _start_listener(handler, output))
+
+
+def _start_listener(handler, output):
+    global _listener
+    handler.queue = queue.Queue(QUEUE_SIZE)
+    _listener = QueueListener(handler.queue, output)
+    _listener.start()
+
+
+def _stop_listener():
+    if _listener is not None:
+        _listener.stop()
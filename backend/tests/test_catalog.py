@@ -0,0 +1,31 @@
+from starlette.requests import Request
+
+from catalog import StaticPayload, payload_response
+
+PAYLOAD = StaticPayload({"skills": ["Python"] * 500})
+
+
+def get(**headers):
+    scope = {"type": "http", "method": "GET", "path": "/",
+             "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]}
+    return payload_response(PAYLOAD, Request(scope))
+
+
+def test_gzip_is_negotiated_with_q_values():
+    assert get(accept_encoding="gzip, deflate").headers.get("content-encoding") == "gzip"
+    assert get(accept_encoding="gzip;q=0, deflate").headers.get("content-encoding") is None
+    assert get(accept_encoding="br, *;q=0.5").headers.get("content-encoding") == "gzip"
+    assert get(accept_encoding="*, gzip;q=0").headers.get("content-encoding") is None
+    assert get().headers.get("content-encoding") is None
+
+
+def test_each_encoding_has_its_own_etag():
+    plain, gzipped = get(), get(accept_encoding="gzip")
+    assert plain.headers["etag"] != gzipped.headers["etag"]
+    assert gzipped.headers["etag"].endswith('-gz"')
+
+    assert get(if_none_match=plain.headers["etag"]).status_code == 304
+    assert get(accept_encoding="gzip", if_none_match=gzipped.headers["etag"]).status_code == 304
+    # A cached identity body does not validate the gzip representation, or the reverse
+    assert get(accept_encoding="gzip", if_none_match=plain.headers["etag"]).status_code == 200
+    assert get(if_none_match=gzipped.headers["etag"]).status_code == 200
@@ -0,0 +1,142 @@
+import glob
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+import sharded_store
+from sharded_store import ShardedStore
+
+
+@pytest.fixture(autouse=True)
+def no_seal_grace(monkeypatch):
+    monkeypatch.setattr(sharded_store, "SEAL_GRACE_SECONDS", 0)
+
+
+def make_store(tmp_path, shard_count=4, retention_days=30):
+    return ShardedStore(str(tmp_path / "live"), str(tmp_path / "archive"), shard_count, retention_days)
+
+
+def record(user_id, days_ago, n):
+    timestamp = (datetime.now() - timedelta(days=days_ago, seconds=n)).isoformat()
+    return {"user_id": user_id, "timestamp": timestamp, "n": n}
+
+
+def test_append_and_read_back_per_user(tmp_path):
+    store = make_store(tmp_path)
+    for n in range(20):
+        store.append(record(f"user_{n % 3}", 0, -n))
+
+    rows = [r for r in store.iter_user("user_1") if r["user_id"] == "user_1"]
+    assert [r["n"] for r in rows] == [-1, -4, -7, -10, -13, -16, -19]
+    assert sum(1 for _ in store.iter_all()) == 20
+
+
+def test_full_pass_archives_expired_records_in_a_single_segment_shard(tmp_path):
+    store = make_store(tmp_path)
+    for n in range(5):
+        store.append(record("alice", 100, n))
+    store.append(record("alice", 1, 99))
+
+    assert store.compact(min_segments=1) == []  # the only segment is still active
+    stats = store.compact(min_segments=1, roll=True)
+
+    assert [(s["records_kept"], s["records_archived"]) for s in stats] == [(1, 5)]
+    assert [r["n"] for r in store.iter_user("alice")] == [99]
+    assert [r["n"] for r in store.iter_user_archive("alice")] == [4, 3, 2, 1, 0]
+    assert sum(1 for _ in store.iter_archive(["timestamp"])) == 5
+
+
+def test_compaction_merges_segments_sorted_and_appends_continue(tmp_path, monkeypatch):
+    monkeypatch.setattr(sharded_store, "SEGMENT_MAX_BYTES", 200)
+    store = make_store(tmp_path, shard_count=1)
+    for n in range(30):
+        store.append(record(f"user_{n % 2}", 0, -n))
+
+    stats = store.compact(min_segments=2)
+    assert stats and stats[0]["records_archived"] == 0
+    store.append(record("user_0", 0, -100))
+
+    rows = [r for r in store.iter_user("user_0") if r["user_id"] == "user_0"]
+    assert len(rows) == 16
+    assert [r["timestamp"] for r in rows] == sorted(r["timestamp"] for r in rows)
+    assert rows[-1]["n"] == -100
+    assert sum(1 for _ in store.iter_all()) == 31
+
+
+def test_changing_shard_count_is_refused(tmp_path):
+    make_store(tmp_path, shard_count=4).append(record("alice", 0, 0))
+    with pytest.raises(ValueError, match="4 shards"):
+        make_store(tmp_path, shard_count=8)
+    assert list(make_store(tmp_path, shard_count=4).iter_user("alice"))
+
+
+def fill_two_segments(store, monkeypatch):
+    monkeypatch.setattr(sharded_store, "SEGMENT_MAX_BYTES", 300)
+    for n in range(12):
+        store.append(record(f"user_{n % 3}", 100 if n < 4 else 0, -n))
+
+
+def test_user_reads_and_counts_use_the_sorted_index(tmp_path, monkeypatch):
+    store = make_store(tmp_path, shard_count=1, retention_days=365)
+    fill_two_segments(store, monkeypatch)
+    store.compact(min_segments=1, roll=True)
+    store.append(record("user_1", 0, -50))
+
+    for user_id in ("user_0", "user_1", "user_2"):
+        scanned = [r for r in store.iter_shard(0) if r["user_id"] == user_id]
+        assert list(store.iter_user(user_id)) == scanned
+        assert store.count_user(user_id) == len(scanned)
+    assert list(store.iter_user("nobody")) == [] and store.count_user("nobody") == 0
+
+
+def test_crash_after_commit_is_finished_on_restart(tmp_path, monkeypatch):
+    store = make_store(tmp_path, shard_count=1)
+    fill_two_segments(store, monkeypatch)
+
+    def crash(self, shard, intent):
+        raise OSError("crash")
+    monkeypatch.setattr(ShardedStore, "_apply_intent", crash)
+    with pytest.raises(OSError):
+        store.compact(min_segments=1, roll=True)
+    monkeypatch.undo()
+    monkeypatch.setattr(sharded_store, "SEAL_GRACE_SECONDS", 0)
+
+    restarted = make_store(tmp_path, shard_count=1)
+    assert sum(1 for _ in restarted.iter_all()) == 8
+    assert sum(1 for _ in restarted.iter_archive()) == 4
+    restarted.compact(min_segments=1, roll=True)
+    assert sum(1 for _ in restarted.iter_archive()) == 4
+
+
+def test_crash_before_commit_leaves_the_old_files(tmp_path, monkeypatch):
+    store = make_store(tmp_path, shard_count=1)
+    fill_two_segments(store, monkeypatch)
+
+    real_replace = os.replace
+
+    def crash_on_intent(src, dst):
+        if dst.endswith(".compaction"):
+            raise OSError("crash")
+        real_replace(src, dst)
+    monkeypatch.setattr(sharded_store.os, "replace", crash_on_intent)
+    with pytest.raises(OSError):
+        store.compact(min_segments=1, roll=True)
+    monkeypatch.setattr(sharded_store.os, "replace", real_replace)
+
+    assert sum(1 for _ in store.iter_all()) == 12
+    stats = store.compact(min_segments=1, roll=True)
+    assert stats[0]["records_archived"] == 4
+    assert sum(1 for _ in store.iter_archive()) == 4
+    assert not glob.glob(str(tmp_path / "**" / "*.tmp"), recursive=True)
+
+
+def test_segments_superseded_by_a_sorted_segment_are_ignored(tmp_path):
+    store = make_store(tmp_path, shard_count=1)
+    store.append(record("alice", 0, 0))
+    shard_dir = tmp_path / "live" / "shard_00"
+    (shard_dir / "00000001.ndjson").rename(shard_dir / "00000001.sorted.ndjson")
+    # A leftover input next to the merged segment it went into
+    (shard_dir / "00000001.ndjson").write_bytes((shard_dir / "00000001.sorted.ndjson").read_bytes())
+
+    assert sum(1 for _ in store.iter_all()) == 1
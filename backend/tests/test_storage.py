@@ -0,0 +1,116 @@
+import importlib
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    """A fresh storage module whose relative data/ directory lives in tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    sys.modules.pop("storage", None)
+    return importlib.import_module("storage")
+
+
+def page_all(storage, user_id, limit):
+    pages, after = [], None
+    while True:
+        page = storage.get_user_interviews(user_id, after, limit + 1)
+        items = page[:limit]
+        pages.append([r["interview_id"] for r in items])
+        if len(page) <= limit:
+            return pages
+        after = storage.history_cursor(items[-1], "timestamp", "interview_id")
+
+
+def test_pagination_keeps_records_sharing_a_timestamp(storage):
+    for interview_id in ("INT_c", "INT_a", "INT_b"):
+        storage.interviews_store.append(
+            {"user_id": "alice", "timestamp": "2026-01-01T10:00:00", "interview_id": interview_id})
+
+    assert page_all(storage, "alice", 1) == [["INT_a"], ["INT_b"], ["INT_c"]]
+
+
+def test_pagination_keeps_records_appended_out_of_order(storage):
+    for interview_id, timestamp in (("INT_1", "2026-01-01T10:00:01"), ("INT_3", "2026-01-01T10:00:03"),
+                                    ("INT_2", "2026-01-01T10:00:02"), ("INT_0", "2026-01-01T10:00:00")):
+        storage.interviews_store.append({"user_id": "alice", "timestamp": timestamp, "interview_id": interview_id})
+
+    assert page_all(storage, "alice", 2) == [["INT_0", "INT_1"], ["INT_2", "INT_3"]]
+    # Clients holding a bare timestamp cursor keep their old meaning: strictly after that time
+    assert [r["interview_id"] for r in storage.get_user_interviews("alice", "2026-01-01T10:00:01")] == \
+        ["INT_2", "INT_3"]
+
+
+def interview(days_ago=0, grade="B"):
+    timestamp = (datetime.now() - timedelta(days=days_ago)).isoformat()
+    return {"timestamp": timestamp, "grade": grade, "detailed_scores": [{"category": "Python", "score": 7}]}
+
+
+def test_analytics_folds_new_delta_lines_incrementally(storage):
+    storage.save_interview("alice", interview())
+    storage.save_interview("bob", interview(grade="A"))
+    assert storage.get_analytics()["interviews"]["grades"] == {"B": 1, "A": 1}
+
+    storage.save_interview("alice", interview())
+    stats = storage.get_analytics()["interviews"]
+    assert stats["count"] == 3
+    assert stats["categories"]["Python"] == {"count": 3, "total_score": 21, "average_score": 7.0}
+
+
+def test_analytics_seals_finished_days_into_snapshots(storage):
+    day = (datetime.now() - timedelta(days=5)).date().isoformat()
+    storage.save_interview("alice", interview(days_ago=5))
+    storage.save_interview("bob", interview(days_ago=5))
+
+    storage.load_analytics()  # folds the log, then seals it
+    analytics_dir = storage.ANALYTICS_DIR
+    assert not os.path.exists(os.path.join(analytics_dir, f"{day}.ndjson"))
+    assert os.path.exists(os.path.join(analytics_dir, f"{day}.json"))
+
+    storage.save_interview("carol", interview(days_ago=5))  # late write goes into the snapshot
+    assert storage.get_analytics(day, day)["interviews"]["count"] == 3
+
+
+def test_analytics_rebuild_resets_offsets_and_keeps_later_saves(storage):
+    for n in range(5):
+        storage.save_interview(f"user_{n}", interview())
+    storage.save_interview("old", interview(days_ago=3))
+    assert storage.get_analytics()["interviews"]["count"] == 6
+
+    # Rebuilt logs are shorter than the offsets this process holds for them
+    storage.rebuild_analytics()
+    storage.save_interview("late", interview())
+    assert storage.get_analytics()["interviews"]["count"] == 7
+
+    # A process that never saw the rebuild still reads the new files from the start
+    storage._analytics_seen.update({day: ("log", inode, 10 ** 6)
+                                    for day, (_, inode, *_) in storage._analytics_seen.items()})
+    storage._analytics["generation"] -= 1
+    assert storage.get_analytics()["interviews"]["count"] == 7
+
+
+def test_job_log_is_folded_by_offset_and_honours_clears(storage):
+    storage.append_jobs([{"job_id": "JOB_1"}, {"job_id": "JOB_2"}])
+    jobs, cleared, offset = storage.read_jobs()
+    assert [j["job_id"] for j in jobs] == ["JOB_1", "JOB_2"] and not cleared
+
+    storage.clear_jobs()
+    storage.append_jobs([{"job_id": "JOB_3"}])
+    jobs, cleared, offset = storage.read_jobs(offset)
+    assert [j["job_id"] for j in jobs] == ["JOB_3"] and cleared
+    assert storage.read_jobs(offset) == ([], False, offset)
+    # A worker starting from scratch skips everything before the last clear
+    assert storage.read_jobs()[:2] == ([{"job_id": "JOB_3"}], True)
+
+
+def test_analysis_history_leaves_out_dedup_signatures_unless_asked_for(storage):
+    storage.save_analysis("alice", {"analysis_id": "ANA_1", "target_role": "Data Scientist",
+                                    "future_proofing_score": 70, "minhash": [1, 2], "line_hashes": [3]})
+
+    [record] = storage.get_user_analyses("alice")
+    assert record["analysis_id"] == "ANA_1" and "minhash" not in record and "line_hashes" not in record
+    [record] = storage.get_user_analyses("alice", fields=["minhash"])
+    assert record["minhash"] == [1, 2]
@@ -0,0 +1,44 @@
+import logging
+import queue
+import sys
+
+import structured_logging
+from structured_logging import DroppingQueueHandler, JsonFormatter, RateLimitFilter
+
+
+def make_record(msg, *args, exc_info=None):
+    return logging.getLogger("skillorbit.test").makeRecord(
+        "skillorbit.test", logging.ERROR, __file__, 1, msg, args, exc_info)
+
+
+def test_rate_limit_keys_on_the_rendered_message_and_exception_type():
+    limit = RateLimitFilter(burst=1)
+    assert limit.filter(make_record("Error loading %s", "a.json"))
+    assert limit.filter(make_record("Error loading %s", "b.json"))
+    assert not limit.filter(make_record("Error loading %s", "a.json"))
+
+    try:
+        raise KeyError("x")
+    except KeyError:
+        assert limit.filter(make_record("Error loading %s", "a.json", exc_info=sys.exc_info()))
+
+
+def test_rate_limit_table_stays_bounded(monkeypatch):
+    monkeypatch.setattr(structured_logging, "RATE_LIMIT_MAX_KEYS", 8)
+    limit = RateLimitFilter()
+    for n in range(100):
+        limit.filter(make_record("user %s failed", n))
+    assert len(limit._seen) <= 8
+
+
+def test_dropped_records_are_reported_on_the_next_written_record(monkeypatch):
+    monkeypatch.setattr(DroppingQueueHandler, "dropped", 0)
+    handler = DroppingQueueHandler(queue.Queue(1))
+    for n in range(4):
+        handler.emit(make_record("message %s", n))
+    handler.queue.get()
+    handler.emit(make_record("after the backlog"))
+
+    line = JsonFormatter().format(handler.queue.get())
+    assert '"dropped": 3' in line
+    assert DroppingQueueHandler.dropped == 3